@@ -0,0 +1,72 @@
+"""
+Cold-start import benchmark for the MCP server.
+
+Imports ``main`` in fresh interpreters (``python -X importtime``), reports the median cumulative import time
+and the slowest modules, and exits non-zero when the median exceeds ``--budget-ms`` or when a module that
+must stay lazy (e.g. ``google.genai``) is imported at startup.
+
+    PYTHONPATH=src:tool_sdk/src python -m benchmarks.import_time --budget-ms 1000
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+LAZY_MODULES = ("google.genai",)
+
+
+def measure_once(module: str) -> dict[str, tuple[int, int]]:
+    """Return ``{module: (self_us, cumulative_us)}`` for one cold import."""
+    env = {k: v for k, v in os.environ.items() if k != "API_KEY"}
+    env["PYTHONPATH"] = os.pathsep.join([str(ROOT / "src"), str(ROOT / "tool_sdk" / "src")])
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT / "src",
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        timings[name] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=10, help="Show the N modules with the highest self time")
+    args = parser.parse_args(argv)
+
+    runs = [measure_once(args.module) for _ in range(args.repeat)]
+    totals_ms = [run[args.module][1] / 1000 for run in runs]
+    median_ms = statistics.median(totals_ms)
+
+    lines = [f"import {args.module}: median {median_ms:.1f} ms, min {min(totals_ms):.1f} ms over {args.repeat} runs"]
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+    lines.extend(f"  {self_us / 1000:8.1f} ms self  {name}" for name, (self_us, _) in slowest)
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f} ms exceeds budget of {args.budget_ms:.1f} ms")
+    eager = [name for name in LAZY_MODULES if any(name in run for run in runs)]
+    if eager:
+        failures.append(f"modules that must be imported lazily were imported at startup: {', '.join(eager)}")
+
+    sys.stdout.write("\n".join(lines + failures) + "\n")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+End-to-end load generator for the MCP server and SDK tool servers.
+
+Boots the server and ``--tools`` stub tools on loopback (unless ``--server-url`` points at a running
+deployment), drives a weighted mix of requests in closed loop (``--concurrency`` workers) or open loop
+(``--rate`` requests per second), and reports throughput, latency percentiles and error rates per endpoint.
+
+Example::
+
+    PYTHONPATH=src:tool_sdk/src python -m benchmarks.loadtest --tools 4 --concurrency 32 --duration 20
+    PYTHONPATH=src:tool_sdk/src python -m benchmarks.loadtest --rate 500 --mix call=8,definitions=1,message=1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENDPOINTS = ("register", "call", "call_batch", "definitions", "message")
+DEFAULT_MIX = "register=1,call=8,definitions=2,message=1"
+PROMPTS = (
+    "add two numbers together",
+    "echo this text back to me",
+    "generate a large payload",
+    "give me a random value",
+    "which tools are available?",
+)
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: dict[str, int] = field(default_factory=dict)
+
+    def record(self, latency: float, status: str, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        count = len(self.latencies)
+        lat_ms = np.asarray(self.latencies) * 1000.0
+        p50, p95, p99 = np.percentile(lat_ms, [50, 95, 99]) if count else (0.0, 0.0, 0.0)
+        return {
+            "requests": count,
+            "throughput_rps": count / elapsed if elapsed > 0 else 0.0,
+            "error_rate": self.errors / count if count else 0.0,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(lat_ms.max()) if count else 0.0,
+            "status_codes": dict(sorted(self.status_codes.items())),
+        }
+
+
+@dataclass
+class Workload:
+    """Builds requests for each endpoint from the manifests advertised by the stub tools."""
+
+    manifests: list[dict[str, Any]]
+    payload_bytes: int = 0
+
+    def register(self, client: httpx.AsyncClient) -> Awaitable[httpx.Response]:
+        return client.post("/register", json=random.choice(self.manifests))  # noqa: S311
+
+    def _call_body(self) -> dict[str, Any]:
+        tool = random.choice(self.manifests)["name"]  # noqa: S311
+        if self.payload_bytes:
+            return {"tool_name": f"{tool}.blob", "args": [self.payload_bytes]}
+        return {"tool_name": f"{tool}.add", "args": [random.randint(0, 100), random.randint(0, 100)]}  # noqa: S311
+
+    def call(self, client: httpx.AsyncClient) -> Awaitable[httpx.Response]:
+        return client.post("/tools/call", json=self._call_body())
+
+    def call_batch(self, client: httpx.AsyncClient) -> Awaitable[httpx.Response]:
+        return client.post("/tools/call", json={**self._call_body(), "priority": "batch"})
+
+    def definitions(self, client: httpx.AsyncClient) -> Awaitable[httpx.Response]:
+        return client.get("/tools/definitions")
+
+    def message(self, client: httpx.AsyncClient) -> Awaitable[httpx.Response]:
+        return client.post("/message", json={"content": random.choice(PROMPTS)})  # noqa: S311
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' in mix; expected one of {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Request mix must contain at least one endpoint with positive weight")
+    return mix
+
+
+class LoadRunner:
+    def __init__(self, client: httpx.AsyncClient, workload: Workload, mix: dict[str, float], warmup: float) -> None:
+        self.client = client
+        self.workload = workload
+        self.names = list(mix)
+        self.weights = list(mix.values())
+        self.warmup = warmup
+        self.stats: dict[str, EndpointStats] = {name: EndpointStats() for name in self.names}
+        self.dropped = 0
+        self._measure_from = 0.0
+
+    def _pick(self) -> str:
+        return random.choices(self.names, weights=self.weights)[0]  # noqa: S311
+
+    async def _issue(self, name: str, started: float) -> None:
+        """Send one request; latency is measured from ``started`` so open-loop queueing delay is included."""
+        request: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]] = getattr(self.workload, name)
+        try:
+            resp = await request(self.client)
+            status, ok = str(resp.status_code), resp.is_success
+        except httpx.HTTPError as e:
+            status, ok = type(e).__name__, False
+        if started >= self._measure_from:
+            self.stats[name].record(time.perf_counter() - started, status, ok)
+
+    async def run_closed(self, concurrency: int, duration: float) -> float:
+        start = time.perf_counter()
+        self._measure_from = start + self.warmup
+        deadline = self._measure_from + duration
+
+        async def worker() -> None:
+            while (now := time.perf_counter()) < deadline:
+                await self._issue(self._pick(), now)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - self._measure_from
+
+    async def run_open(self, rate: float, duration: float, max_inflight: int, poisson: bool) -> float:
+        start = time.perf_counter()
+        self._measure_from = start + self.warmup
+        deadline = self._measure_from + duration
+        inflight: set[asyncio.Task] = set()
+        next_at = start
+
+        while next_at < deadline:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(inflight) >= max_inflight:
+                if next_at >= self._measure_from:
+                    self.dropped += 1
+            else:
+                task = asyncio.create_task(self._issue(self._pick(), next_at))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
+            next_at += random.expovariate(rate) if poisson else 1.0 / rate  # noqa: S311
+
+        await asyncio.gather(*inflight)
+        return time.perf_counter() - self._measure_from
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        endpoints = {name: stats.summary(elapsed) for name, stats in self.stats.items()}
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies.extend(stats.latencies)
+            total.errors += stats.errors
+            for code, n in stats.status_codes.items():
+                total.status_codes[code] = total.status_codes.get(code, 0) + n
+        return {
+            "elapsed_s": elapsed,
+            "dropped": self.dropped,
+            "endpoints": endpoints,
+            "total": total.summary(elapsed),
+        }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    header = f"{'endpoint':<12} {'reqs':>8} {'rps':>9} {'err%':>7} {'p50ms':>9} {'p95ms':>9} {'p99ms':>9} {'maxms':>9}"
+    lines = [header, "-" * len(header)]
+    rows = [*report["endpoints"].items(), ("total", report["total"])]
+    for name, s in rows:
+        lines.append(
+            f"{name:<12} {s['requests']:>8} {s['throughput_rps']:>9.1f} {s['error_rate'] * 100:>6.2f}% "
+            f"{s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}",
+        )
+    lines.append(f"elapsed: {report['elapsed_s']:.2f}s  dropped (client-side, open loop): {report['dropped']}")
+    for name, s in rows:
+        lines.append(f"{name} status codes: {s['status_codes']}")
+    return "\n".join(lines)
+
+
+def _wait_until(
+    client: httpx.Client,
+    url: str,
+    timeout: float,
+    predicate: Callable[[httpx.Response], bool] = lambda r: r.is_success,
+) -> httpx.Response:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            resp = client.get(url, timeout=1.0)
+            if predicate(resp):
+                return resp
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"Timed out waiting for {url}")
+
+
+def _served_manifests(server_url: str, transport: str) -> list[dict[str, Any]]:
+    """Top-level tools already registered on the server that the workload can call."""
+    definitions = httpx.get(f"{server_url}/tools/definitions", timeout=10.0).json()
+    return [
+        {"name": name, "base_url": d["base_url"]}
+        for name, d in definitions.items()
+        if "." not in name and (d.get("external") or (transport == "inprocess" and d.get("transport") == "inprocess"))
+    ]
+
+
+@contextmanager
+def deployment(args: argparse.Namespace) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """Start the server and stub tools as subprocesses; yields the server URL and the tool manifests."""
+    if args.server_url:
+        yield args.server_url.rstrip("/"), _served_manifests(args.server_url.rstrip("/"), args.transport)
+        return
+
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(ROOT / "tool_sdk" / "src")])}
+    output = None if args.verbose else subprocess.DEVNULL
+    procs: list[subprocess.Popen] = []
+    server_url = f"http://127.0.0.1:{args.server_port}"
+    socket_dir = tempfile.TemporaryDirectory(prefix="mcp-loadtest-")
+    try:
+        server_cmd = [
+            sys.executable,
+            *("-m", "benchmarks.server", "--port", str(args.server_port), "--workers", str(args.workers)),
+        ]
+        if not args.real_embeddings:
+            server_cmd.append("--fake-embeddings")
+        server_env = (
+            {**env, "LOCAL_TOOL_MODULES": "benchmarks.stub_tool:LOCAL_STUBS"} if args.transport == "inprocess" else env
+        )
+        procs.append(subprocess.Popen(server_cmd, cwd=ROOT, env=server_env, stdout=output, stderr=output))  # noqa: S603
+        with httpx.Client() as client:
+            _wait_until(client, f"{server_url}/ready", args.boot_timeout)
+        if args.transport == "inprocess":
+            yield server_url, _served_manifests(server_url, args.transport)
+            return
+
+        tools: list[tuple[str, str | None]] = []
+        for i in range(args.tools):
+            cmd = [sys.executable, "-m", "benchmarks.stub_tool", "--name", f"stub{i}"]
+            if args.transport == "uds":
+                socket_path = os.path.join(socket_dir.name, f"stub{i}.sock")
+                tool_url, bind = f"unix://{socket_path}", ["--uds", socket_path]
+            else:
+                socket_path = None
+                tool_url = f"http://127.0.0.1:{args.tool_base_port + i}"
+                bind = ["--port", str(args.tool_base_port + i)]
+            tool_env = {**env, "MCP_SERVER_URL": server_url, "TOOL_PUBLIC_URL": tool_url}
+            procs.append(subprocess.Popen(cmd + bind, cwd=ROOT, env=tool_env, stdout=output, stderr=output))  # noqa: S603
+            tools.append((tool_url, socket_path))
+
+        manifests: list[dict[str, Any]] = []
+        for i, (tool_url, socket_path) in enumerate(tools):
+            base = "http://localhost" if socket_path else tool_url
+            with httpx.Client(transport=httpx.HTTPTransport(uds=socket_path) if socket_path else None) as client:
+                manifests.extend(_wait_until(client, f"{base}/manifest", args.boot_timeout).json())
+            with httpx.Client() as client:
+                _wait_until(
+                    client, f"{server_url}/tools", args.boot_timeout, lambda r, i=i: f"stub{i}" in r.json()["tools"]
+                )
+        yield server_url, manifests
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        socket_dir.cleanup()
+
+
+async def run(args: argparse.Namespace, server_url: str, manifests: list[dict[str, Any]]) -> dict[str, Any]:
+    mix = parse_mix(args.mix)
+    if args.transport == "inprocess" and "register" in mix:
+        raise ValueError("'register' cannot be part of the mix with --transport inprocess")
+    if not manifests and {"register", "call", "call_batch"} & mix.keys():
+        raise RuntimeError("No tools available for 'register'/'call' requests")
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=server_url, timeout=args.timeout, limits=limits) as client:
+        runner = LoadRunner(client, Workload(manifests, args.payload_bytes), mix, args.warmup)
+        if args.rate:
+            elapsed = await runner.run_open(args.rate, args.duration, args.max_inflight, args.arrival == "poisson")
+        else:
+            elapsed = await runner.run_closed(args.concurrency, args.duration)
+    report = runner.report(elapsed)
+    report["config"] = {k: v for k, v in vars(args).items() if k != "json"}
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server-url", help="Target an already running server instead of booting one locally")
+    parser.add_argument("--server-port", type=int, default=5700)
+    parser.add_argument("--tool-base-port", type=int, default=5800)
+    parser.add_argument("--tools", type=int, default=2, help="Number of stub tool servers to boot")
+    parser.add_argument(
+        "--transport",
+        choices=["tcp", "uds", "inprocess"],
+        default="tcp",
+        help="How the server reaches the stub tools: TCP, Unix domain sockets, or mounted in the server process",
+    )
+    parser.add_argument("--real-embeddings", action="store_true", help="Use Gemini embeddings (requires API_KEY)")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes (shared registry mode if > 1)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted endpoint mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=16, help="Closed loop: number of concurrent workers")
+    parser.add_argument("--rate", type=float, default=0.0, help="Open loop: target requests/second (overrides -c)")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="poisson")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="Open loop: drop arrivals above this")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds excluded from the report")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--max-connections", type=int, default=256)
+    parser.add_argument("--payload-bytes", type=int, default=0, help="Call `blob(size)` instead of `add(a, b)`")
+    parser.add_argument("--boot-timeout", type=float, default=60.0)
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON to this path")
+    parser.add_argument("--verbose", action="store_true", help="Show server and tool output")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    with deployment(args) as (server_url, manifests):
+        report = asyncio.run(run(args, server_url, manifests))
+    sys.stdout.write(format_report(report) + "\n")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
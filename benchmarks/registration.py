@@ -0,0 +1,87 @@
+"""
+Registration scaling benchmark.
+
+Registers ``--tools`` synthetic HTTP manifests (``--methods`` each) into an empty registry, once per manifest with
+``register_tool`` and once as a single batch with ``register_tools`` (the path taken when restoring a snapshot
+or catching up with other workers), doubling the tool count ``--steps`` times. Batched registration should
+scale linearly; the script exits non-zero when its time grows more than ``--max-growth`` times per doubling.
+
+    PYTHONPATH=src python -m benchmarks.registration --tools 1000 --steps 3
+"""
+
+import argparse
+import gc
+import logging
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from core.registry.registry import Registry
+
+
+def manifests(tools: int, methods: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "name": f"tool{i}",
+            "base_url": f"http://tool{i}:5080",
+            "description": f"Synthetic tool {i}",
+            "methods": [{"name": f"m{j}", "description": f"Method {j} of tool {i}"} for j in range(methods)],
+        }
+        for i in range(tools)
+    ]
+
+
+def timed(
+    register: Callable[[Registry, list[dict[str, Any]]], None], batch: list[dict[str, Any]], repeat: int
+) -> float:
+    """Best of ``repeat`` registrations of ``batch`` into a fresh registry."""
+    best = float("inf")
+    for _ in range(repeat):
+        registry = Registry("benchmark")
+        gc.collect()
+        start = time.perf_counter()
+        register(registry, batch)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def one_by_one(registry: Registry, batch: list[dict[str, Any]]) -> None:
+    for tool_data in batch:
+        registry.register_tool(tool_data)
+
+
+def batched(registry: Registry, batch: list[dict[str, Any]]) -> None:
+    registry.register_tools(batch)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", type=int, default=1000)
+    parser.add_argument("--methods", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=3, help="How many times to double the tool count")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    lines, failures = [], []
+    previous = None
+    for step in range(args.steps):
+        tools = args.tools * 2**step
+        batch = manifests(tools, args.methods)
+        single, bulk = timed(one_by_one, batch, 1), timed(batched, batch, args.repeat)
+        lines.append(f"{tools:6d} tools: register_tool {single:7.3f} s, register_tools {bulk:7.3f} s")
+        if previous is not None and bulk > previous * args.max_growth:
+            failures.append(
+                f"register_tools took {bulk / previous:.1f}x longer for {tools} tools than for half as many"
+            )
+        previous = bulk
+
+    sys.stdout.write("\n".join(lines + failures) + "\n")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
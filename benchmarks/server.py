@@ -0,0 +1,80 @@
+"""Boot the MCP server for benchmarking, optionally with a deterministic offline embedding function."""
+
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import uvicorn
+
+EMBEDDING_DIM = 64
+
+
+def fake_embed(*, contents: str | list[str], **_: Any) -> SimpleNamespace:
+    """Deterministic stand-in for ``client.models.embed_content`` that never leaves the process."""
+    texts = contents if isinstance(contents, list) else [contents]
+    embeddings = []
+    for text in texts:
+        seed = int.from_bytes(hashlib.sha256(str(text).encode()).digest()[:8], "little")
+        values = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+        embeddings.append(SimpleNamespace(values=values.tolist()))
+    return SimpleNamespace(embeddings=embeddings)
+
+
+def build_app(fake_embeddings: bool) -> Any:
+    if fake_embeddings:
+        os.environ.setdefault("API_KEY", "loadtest")
+        from core.registry.registry import registry
+
+        registry._vec_db.embedding_function = fake_embed
+
+    from main import app
+
+    return app
+
+
+def create_app() -> Any:
+    """App factory for multi-worker runs, where uvicorn imports the app in every worker process."""
+    return build_app(os.getenv("BENCH_FAKE_EMBEDDINGS") == "1")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--fake-embeddings", action="store_true", help="Replace Gemini embeddings with a local hash")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Worker processes; more than one shares state via SHARED_STATE_DIR"
+    )
+    args = parser.parse_args()
+
+    if args.workers == 1:
+        app = build_app(args.fake_embeddings)
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+        return
+
+    os.environ["BENCH_FAKE_EMBEDDINGS"] = "1" if args.fake_embeddings else "0"
+    shared_dir = None
+    if not os.getenv("SHARED_STATE_DIR"):
+        shared_dir = os.environ["SHARED_STATE_DIR"] = tempfile.mkdtemp(prefix="mcp-shared-", dir="/dev/shm")
+    try:
+        uvicorn.run(
+            "benchmarks.server:create_app",
+            factory=True,
+            workers=args.workers,
+            host=args.host,
+            port=args.port,
+            log_level="warning",
+            access_log=False,
+        )
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
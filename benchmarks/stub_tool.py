@@ -0,0 +1,48 @@
+"""Minimal tool server built with ``create_app``, used as a load-test target."""
+
+import argparse
+from typing import Callable
+
+import uvicorn
+
+from tool_sdk import create_app, mcp_tool  # type: ignore[attr-defined]
+
+
+def build_methods(name: str) -> list[Callable]:
+    @mcp_tool(name=name)
+    def echo(text: str) -> str:
+        """Return the given text unchanged."""
+        return text
+
+    @mcp_tool(name=name)
+    def add(a: int, b: int) -> int:
+        """Add two integers and return the result."""
+        return a + b
+
+    @mcp_tool(name=name)
+    def blob(size: int) -> str:
+        """Return a string payload of the requested size in bytes."""
+        return "x" * size
+
+    return [echo, add, blob]
+
+
+# Mounted into the server process by `loadtest --transport inprocess` via LOCAL_TOOL_MODULES.
+LOCAL_STUBS = build_methods("local_stub")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--uds", help="Serve on this Unix domain socket instead of host:port")
+    args = parser.parse_args()
+
+    app = create_app(build_methods(args.name))
+    bind = {"uds": args.uds} if args.uds else {"host": args.host, "port": args.port}
+    uvicorn.run(app, **bind, log_level="warning", access_log=False, log_config=None)
+
+
+if __name__ == "__main__":
+    main()
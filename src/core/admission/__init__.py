@@ -0,0 +1,3 @@
+from core.admission.controller import AdmissionController, AdmissionRejected, Priority
+
+__all__ = ["AdmissionController", "AdmissionRejected", "Priority"]
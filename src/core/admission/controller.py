@@ -0,0 +1,190 @@
+import asyncio
+import bisect
+import itertools
+import math
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import AsyncIterator
+
+from core import get_logger
+
+logger = get_logger(__name__)
+
+
+class Priority(StrEnum):
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+_RANK = {Priority.INTERACTIVE: 0, Priority.BATCH: 1}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call cannot be admitted; ``retry_after`` is a hint in whole seconds."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    tool: str = field(compare=False)
+    priority: Priority = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    """
+    Bound outstanding tool calls globally and per tool.
+
+    A call runs immediately when a global and a per-tool slot are free and nothing of equal or higher priority
+    is waiting. Otherwise it waits in a bounded priority queue (interactive before batch, FIFO within a class)
+    for at most its queue timeout. Batch calls never take the last ``interactive_reserve`` global slots.
+    Full queues and expired queue deadlines raise ``AdmissionRejected`` with a ``Retry-After`` estimate.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_concurrency_per_tool: int = 8,
+        max_queue: int = 256,
+        max_queue_per_tool: int = 64,
+        interactive_reserve: int = 4,
+        queue_timeouts: dict[Priority, float] | None = None,
+    ) -> None:
+        """Initialize the controller.
+        Args:
+            max_concurrency (int): Calls executing at once across all tools.
+            max_concurrency_per_tool (int): Calls executing at once for a single tool.
+            max_queue (int): Calls allowed to wait across all tools.
+            max_queue_per_tool (int): Calls allowed to wait for a single tool.
+            interactive_reserve (int): Global slots only interactive calls may use.
+            queue_timeouts (dict): Maximum seconds a call of each priority may wait for a slot.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_tool = max_concurrency_per_tool
+        self.max_queue = max_queue
+        self.max_queue_per_tool = max_queue_per_tool
+        self.interactive_reserve = min(interactive_reserve, max_concurrency - 1)
+        self.queue_timeouts = {Priority.INTERACTIVE: 2.0, Priority.BATCH: 30.0, **(queue_timeouts or {})}
+        self._running = 0
+        self._running_by_tool: Counter[str] = Counter()
+        self._queued_by_tool: Counter[str] = Counter()
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._service_time = 0.1  # EWMA of call duration in seconds, used for Retry-After
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            max_concurrency=int(os.getenv("TOOL_CALL_MAX_CONCURRENCY", "32")),
+            max_concurrency_per_tool=int(os.getenv("TOOL_CALL_MAX_CONCURRENCY_PER_TOOL", "8")),
+            max_queue=int(os.getenv("TOOL_CALL_MAX_QUEUE", "256")),
+            max_queue_per_tool=int(os.getenv("TOOL_CALL_MAX_QUEUE_PER_TOOL", "64")),
+            interactive_reserve=int(os.getenv("TOOL_CALL_INTERACTIVE_RESERVE", "4")),
+            queue_timeouts={
+                Priority.INTERACTIVE: float(os.getenv("TOOL_CALL_QUEUE_TIMEOUT_MS", "2000")) / 1000.0,
+                Priority.BATCH: float(os.getenv("TOOL_CALL_BATCH_QUEUE_TIMEOUT_MS", "30000")) / 1000.0,
+            },
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {"running": self._running, "queued": len(self._queue)}
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        tool: str,
+        priority: Priority = Priority.INTERACTIVE,
+        queue_timeout: float | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold an execution slot for ``tool`` for the duration of the block."""
+        await self._acquire(tool, priority, queue_timeout)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(tool, time.monotonic() - started)
+
+    def _can_run(self, tool: str, priority: Priority) -> bool:
+        limit = self.max_concurrency - (self.interactive_reserve if priority == Priority.BATCH else 0)
+        return self._running < limit and self._running_by_tool[tool] < self.max_concurrency_per_tool
+
+    def _start(self, tool: str) -> None:
+        self._running += 1
+        self._running_by_tool[tool] += 1
+
+    def _retry_after(self) -> int:
+        backlog = len(self._queue) + self._running
+        return max(1, math.ceil(backlog * self._service_time / self.max_concurrency))
+
+    async def _acquire(self, tool: str, priority: Priority, queue_timeout: float | None) -> None:
+        rank = _RANK[priority]
+        if self._can_run(tool, priority) and not any(w.rank <= rank for w in self._queue):
+            self._start(tool)
+            return
+
+        if len(self._queue) >= self.max_queue or self._queued_by_tool[tool] >= self.max_queue_per_tool:
+            logger.warning("Tool call rejected: queue full", extra={"tool_name": tool, "priority": priority})
+            raise AdmissionRejected(f"Too many pending calls for '{tool}'", self._retry_after())
+
+        waiter = _Waiter(rank, next(self._seq), tool, priority, asyncio.get_running_loop().create_future())
+        bisect.insort(self._queue, waiter)
+        self._queued_by_tool[tool] += 1
+        # Waiters ahead of us may be blocked only by their own tool's limit; let this one through if it can run.
+        self._dispatch()
+        # Callers may ask to give up sooner, never to wait longer than the configured deadline.
+        timeout = self.queue_timeouts[priority]
+        if queue_timeout is not None:
+            timeout = min(queue_timeout, timeout)
+        try:
+            done, _ = await asyncio.wait({waiter.future}, timeout=timeout)
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(tool, 0.0, record=False)
+            else:
+                self._forget(waiter)
+            raise
+        if not done:
+            self._forget(waiter)
+            logger.warning("Tool call rejected: queue deadline exceeded", extra={"tool_name": tool})
+            raise AdmissionRejected(f"Call to '{tool}' waited longer than {timeout:.3f}s", self._retry_after())
+
+    def _forget(self, waiter: _Waiter) -> None:
+        waiter.future.cancel()
+        index = bisect.bisect_left(self._queue, waiter)
+        if index < len(self._queue) and self._queue[index] is waiter:
+            del self._queue[index]
+            self._decrement(self._queued_by_tool, waiter.tool)
+
+    def _release(self, tool: str, duration: float, record: bool = True) -> None:
+        self._running -= 1
+        self._decrement(self._running_by_tool, tool)
+        if record:
+            self._service_time = 0.9 * self._service_time + 0.1 * duration
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiters in priority order, skipping ones whose tool is at its limit."""
+        remaining = []
+        for waiter in self._queue:
+            if not waiter.future.done() and self._can_run(waiter.tool, waiter.priority):
+                self._start(waiter.tool)
+                waiter.future.set_result(None)
+                self._decrement(self._queued_by_tool, waiter.tool)
+            elif not waiter.future.done():
+                remaining.append(waiter)
+        self._queue = remaining
+
+    @staticmethod
+    def _decrement(counter: Counter[str], tool: str) -> None:
+        counter[tool] -= 1
+        if counter[tool] <= 0:
+            del counter[tool]
@@ -0,0 +1,4 @@
+from core.blobs.router import router as blobs_router
+from core.blobs.store import BlobNotFound, BlobStore, HANDLE_KEY, is_handle
+
+__all__ = ["HANDLE_KEY", "BlobNotFound", "BlobStore", "blobs_router", "is_handle"]
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from core.blobs.store import BlobNotFound, BlobStore, MEDIA_TYPES, validate_blob
+
+router = APIRouter()
+
+_SUFFIXES = {media_type: suffix for suffix, media_type in MEDIA_TYPES.items()}
+
+
+def _store(request: Request) -> BlobStore:
+    store = getattr(request.app.state, "blob_store", None)
+    if store is None:
+        raise HTTPException(status_code=404, detail="Blob store is not enabled; set BLOB_STORE_DIR")
+    return store
+
+
+@router.post("/blobs", status_code=201)
+async def put_blob(request: Request) -> dict[str, Any]:
+    """Store the request body and return its handle; Content-Type is application/json or application/x-npy."""
+    store = _store(request)
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type not in _SUFFIXES:
+        raise HTTPException(status_code=415, detail=f"Unsupported blob type: {media_type or 'none'}")
+    data = await _read_upload(request, store.max_upload_bytes)
+    try:
+        return await asyncio.to_thread(_put_valid, store, data, _SUFFIXES[media_type])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid {media_type} blob: {e}")
+
+
+async def _read_upload(request: Request, max_size: int) -> bytes:
+    """The request body, refused with 413 as soon as it is known to exceed ``max_size`` bytes."""
+    too_large = HTTPException(status_code=413, detail=f"Blob exceeds {max_size} bytes")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_size:
+        raise too_large
+    # Content-Length may be missing (chunked uploads) or understate the body; count what actually arrives.
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_size:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _put_valid(store: BlobStore, data: bytes, suffix: str) -> dict[str, Any]:
+    # Stored blobs are memory-mapped by tools without further checks, so malformed uploads never get in.
+    validate_blob(data, suffix)
+    return store.put(data, suffix)
+
+
+@router.get("/blobs/{blob_id}")
+async def get_blob(request: Request, blob_id: str) -> FileResponse:
+    try:
+        path = _store(request).path(blob_id)
+    except BlobNotFound:
+        raise HTTPException(status_code=404, detail=f"Blob '{blob_id}' not found")
+    return FileResponse(path, media_type=MEDIA_TYPES[path.suffix])
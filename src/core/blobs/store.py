@@ -0,0 +1,190 @@
+import asyncio
+import io
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import orjson
+
+# Handles and the blob file format are shared with the SDK's tool apps.
+from tool_sdk.blobs import (
+    BLOB_ID,
+    BlobNotFound,
+    encode_blob,
+    HANDLE_KEY,
+    is_handle,
+    load_file,
+    MEDIA_TYPES,
+    store_file,
+)
+
+from core import get_logger
+
+logger = get_logger(__name__)
+
+_NPY_HEADER_READERS = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+
+
+def validate_blob(data: bytes, suffix: str) -> None:
+    """Raise ``ValueError`` unless ``data`` is a well-formed blob of type ``suffix``.
+
+    ``.npy`` blobs are checked from their header alone: a supported format version, no object dtype, and
+    exactly as many bytes as the shape and dtype call for.
+    """
+    if not data:
+        raise ValueError("Empty blob")
+    if suffix == ".json":
+        orjson.loads(data)
+        return
+    stream = io.BytesIO(data)
+    version = np.lib.format.read_magic(stream)
+    if version not in _NPY_HEADER_READERS:
+        raise ValueError(f"Unsupported .npy format version {version}")
+    shape, _, dtype = _NPY_HEADER_READERS[version](stream)
+    if dtype.hasobject:
+        raise ValueError("Arrays of Python objects are not accepted")
+    expected = stream.tell() + math.prod(shape) * dtype.itemsize
+    if len(data) != expected:
+        raise ValueError(f"Array data is {len(data) - stream.tell()} bytes, expected {expected - stream.tell()}")
+
+
+class BlobStore:
+    """
+    Content-addressed store for large tool inputs and outputs, kept in a directory on the local host.
+
+    A blob is named by the SHA-256 of its bytes, so a value is written once however often it is stored, and
+    a handle can be passed from one tool call to the next in place of the value. Tools on the same host read
+    blobs straight from ``directory`` (``.npy`` blobs memory-mapped), others fetch them from ``/blobs``.
+    Blobs not used for ``ttl`` seconds are evicted, then the least recently used ones while the store holds
+    more than ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = 1 << 30,
+        ttl: float = 3600.0,
+        inline_limit: int | None = None,
+        max_upload_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        """Initialize the store.
+        Args:
+            directory (str | Path): Directory holding the blobs; created if missing.
+            max_bytes (int): Total size above which least recently used blobs are evicted.
+            ttl (float): Seconds after its last use at which a blob is evicted.
+            inline_limit (int, optional): Results of in-process tools larger than this many bytes are stored
+                and returned as handles. None keeps every result inline.
+            max_upload_bytes (int): Largest body accepted by ``POST /blobs``.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.inline_limit = inline_limit
+        self.max_upload_bytes = max_upload_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "BlobStore | None":
+        directory = os.getenv("BLOB_STORE_DIR")
+        if not directory:
+            return None
+        inline_limit = os.getenv("BLOB_INLINE_LIMIT_BYTES")
+        return cls(
+            directory,
+            max_bytes=int(os.getenv("BLOB_STORE_MAX_BYTES", str(1 << 30))),
+            ttl=float(os.getenv("BLOB_STORE_TTL_S", "3600")),
+            inline_limit=int(inline_limit) if inline_limit else None,
+            # The same limit CompressionMiddleware applies to decompressed bodies.
+            max_upload_bytes=int(os.getenv("MAX_REQUEST_BODY_BYTES", str(32 * 1024 * 1024))),
+        )
+
+    def put(self, data: bytes, suffix: str) -> dict[str, Any]:
+        """Store ``data`` (serialized as ``suffix`` says) and return its handle."""
+        if suffix not in MEDIA_TYPES:
+            raise ValueError(f"Unsupported blob type: {suffix}")
+        return store_file(self.directory, data, suffix)
+
+    def put_value(self, value: Any) -> dict[str, Any]:
+        return self.put(*encode_blob(value))
+
+    def path(self, blob_id: str) -> Path:
+        """Path of a stored blob, counted as a use for eviction. Raises ``BlobNotFound`` for unknown or
+        malformed ids."""
+        if not BLOB_ID.fullmatch(blob_id):
+            raise BlobNotFound(blob_id)
+        path = self.directory / blob_id
+        try:
+            # Tools fetching the blob over /blobs use it as much as tools reading it here.
+            os.utime(path)
+        except FileNotFoundError:
+            raise BlobNotFound(blob_id) from None
+        return path
+
+    def load(self, blob_id: str) -> Any:
+        """The value of a blob, read through a memory map; ``.npy`` blobs stay mapped (read-only)."""
+        path = self.path(blob_id)
+        try:
+            return load_file(path)
+        except FileNotFoundError:
+            raise BlobNotFound(blob_id) from None
+
+    def resolve(self, value: Any) -> Any:
+        """``value`` with every handle in it, at any depth, replaced by the blob's value."""
+        if is_handle(value):
+            return self.load(value[HANDLE_KEY])
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def offload(self, value: Any) -> Any:
+        """A handle for ``value`` when it serializes to more than ``inline_limit`` bytes, else ``value``.
+
+        Values kept inline come back pre-serialized (``orjson.Fragment``), so they are not encoded twice.
+        """
+        if self.inline_limit is None or value is None or isinstance(value, bool | int | float):
+            return value
+        data, suffix = encode_blob(value)
+        if len(data) > self.inline_limit:
+            return self.put(data, suffix)
+        return value if suffix == ".npy" else orjson.Fragment(data)
+
+    def evict(self) -> int:
+        """Drop expired blobs, then the least recently used while over ``max_bytes``. Returns the count."""
+        now = time.time()
+        blobs = []
+        for path in self.directory.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            # Temporary files are only evicted once their write was evidently abandoned.
+            if path.name.startswith(".") and now - stat.st_mtime <= self.ttl:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, path))
+        blobs.sort()
+        total = sum(size for _, size, _ in blobs)
+        evicted = 0
+        for mtime, size, path in blobs:
+            if now - mtime <= self.ttl and total <= self.max_bytes:
+                break
+            # Readers that mapped the blob keep their pages after the unlink.
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        if evicted:
+            logger.info("Evicted blobs", extra={"evicted": evicted, "bytes": total})
+        return evicted
+
+    async def run(self) -> None:
+        """Evict periodically until cancelled."""
+        while True:
+            await asyncio.sleep(min(self.ttl / 4, 60.0))
+            try:
+                await asyncio.to_thread(self.evict)
+            except Exception:
+                logger.exception("Failed to evict blobs")
@@ -1,3 +1,4 @@
+from core.communication.cache import SemanticCache
 from core.communication.router import router as communication_router
 
-__all__ = ["communication_router"]
+__all__ = ["SemanticCache", "communication_router"]
@@ -0,0 +1,106 @@
+import os
+from typing import Any, Hashable
+
+import numpy as np
+from numpy import ndarray
+
+from core import get_logger
+
+logger = get_logger(__name__)
+
+
+class SemanticCache:
+    """
+    Small cache of recent routing decisions keyed by query embedding.
+
+    Embeddings of the last ``capacity`` queries are kept as rows of one matrix, so a lookup is a single
+    matrix-vector product. A query whose cosine similarity to a cached one is at least ``threshold`` gets the
+    cached answer. Identical query texts are answered without embedding at all. All entries are dropped when
+    the ``version`` passed in changes, i.e. whenever the registry or its index changes.
+    """
+
+    def __init__(self, capacity: int = 256, threshold: float = 0.95) -> None:
+        """Initialize the cache.
+        Args:
+            capacity (int): Maximum number of cached queries; the oldest entry is overwritten when full.
+            threshold (float): Minimum cosine similarity for a cached answer to be reused.
+        """
+        self.capacity = capacity
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._vectors: ndarray | None = None
+        self._values: list[Any] = [None] * capacity
+        self._texts: list[str | None] = [None] * capacity
+        self._by_text: dict[str, int] = {}
+        self._size = 0
+        self._next = 0
+        self._version: Hashable = None
+
+    def clear(self) -> None:
+        self._values = [None] * self.capacity
+        self._texts = [None] * self.capacity
+        self._by_text.clear()
+        self._size = 0
+        self._next = 0
+
+    def _sync(self, version: Hashable) -> None:
+        if version != self._version:
+            if self._size:
+                logger.debug("Registry changed; clearing semantic cache", extra={"entries": self._size})
+            self.clear()
+            self._version = version
+
+    def get_text(self, text: str, version: Hashable) -> Any | None:
+        """Return the cached answer for exactly this query text, if any."""
+        self._sync(version)
+        slot = self._by_text.get(text)
+        if slot is None:
+            return None
+        self.hits += 1
+        return self._values[slot]
+
+    def get(self, vector: ndarray, version: Hashable) -> Any | None:
+        """Return the cached answer of the most similar cached query above the threshold, if any."""
+        self._sync(version)
+        if self._size == 0 or self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+            self.misses += 1
+            return None
+        similarities = self._vectors[: self._size] @ _normalize(vector)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._values[best]
+
+    def put(self, text: str, vector: ndarray, value: Any, version: Hashable) -> None:
+        self._sync(version)
+        if self.capacity <= 0:
+            return
+        if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+            self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            self.clear()
+
+        slot = self._next
+        old_text = self._texts[slot]
+        if old_text is not None and self._by_text.get(old_text) == slot:
+            del self._by_text[old_text]
+        self._vectors[slot] = _normalize(vector)
+        self._values[slot] = value
+        self._texts[slot] = text
+        self._by_text[text] = slot
+        self._next = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+
+def _normalize(vector: ndarray) -> ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def cache_from_env() -> SemanticCache:
+    return SemanticCache(
+        capacity=int(os.getenv("SEMANTIC_CACHE_SIZE", "256")),
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+    )
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from core import get_logger
+from core.communication.cache import cache_from_env
 from core.models import MessageRequest, MessageResponse
 from core.registry import registry
 
@@ -8,13 +9,29 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+routing_cache = cache_from_env()
+
 
 @router.post("/message", response_model=MessageResponse)
 async def handle_message(request: MessageRequest) -> MessageResponse:
     logger.info("Received message request", extra={"request": request})
 
+    version = registry.index_version
+    cached = routing_cache.get_text(request.content, version)
+    if cached is not None:
+        logger.info("Routing decision served from cache (exact match)")
+        return MessageResponse(content=cached)
+
+    query_vector = await registry.aembed_query(request.content)
+    cached = routing_cache.get(query_vector, version)
+    if cached is not None:
+        logger.info("Routing decision served from cache (semantic match)")
+        return MessageResponse(content=cached)
+
     logger.info("Queried tools based on message content")
-    result = registry.query_tools_by_description(request.content)
+    result = registry.query_tools_by_vector(query_vector)
     logger.info("Tools matching the message", extra={"result": result})
 
-    return MessageResponse(content=f"Found tools: {result}")
+    content = f"Found tools: {result}"
+    routing_cache.put(request.content, query_vector, content, version)
+    return MessageResponse(content=content)
@@ -0,0 +1,4 @@
+# One implementation, shared with the SDK's tool apps.
+from tool_sdk.encoding import CompressionMiddleware, dumps, FastJSONResponse, negotiate_encoding
+
+__all__ = ["CompressionMiddleware", "FastJSONResponse", "dumps", "negotiate_encoding"]
@@ -1,3 +1,3 @@
-from .logging import get_logger
+from .logging import get_logger, JsonFormatter, SamplingFilter, shutdown_logging
 
-__all__ = ["get_logger"]
+__all__ = ["JsonFormatter", "SamplingFilter", "get_logger", "shutdown_logging"]
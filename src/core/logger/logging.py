@@ -1,17 +1,32 @@
+import atexit
+import copy
+import json
 import logging
 import logging.config
 import os
+import queue
 import sys
+import threading
+import time
 import tomllib
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from logging import Logger
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
 
 _logger_configured = False
+_listeners: list[QueueListener] = []
 
+_DEFAULT_OUTPUT = {"log_to_console": True, "log_to_file": False, "format": "text", "queue": True}
 
-def _get_logging_config() -> dict:
-    """Get logging configuration from verbose_config.toml"""
+# Attributes every LogRecord has; anything else on a record came from ``extra``.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+@lru_cache(maxsize=1)
+def _load_config() -> dict:
+    """Read verbose_config.toml once per process."""
     try:
         verbose_config_path = os.path.join(os.path.dirname(__file__), "verbose_config.toml")
         if not os.path.exists(verbose_config_path):
@@ -20,15 +35,171 @@ def _get_logging_config() -> dict:
 
         if os.path.exists(verbose_config_path):
             with open(verbose_config_path, "rb") as f:
-                config = tomllib.load(f)
-            return config.get("logging", {}).get("output", {})
-        else:
-            # No verbose_config.toml found, use defaults
-            return {"log_to_console": True, "log_to_file": False}
+                return tomllib.load(f).get("logging", {})
+        # No verbose_config.toml found, use defaults
+        return {}
 
     except (FileNotFoundError, tomllib.TOMLDecodeError, OSError) as e:
         sys.stderr.write(f"Warning: Could not read verbose_config.toml: {e}. Using defaults.\n")
-        return {"log_to_console": True, "log_to_file": False}
+        return {}
+
+
+def _get_logging_config() -> dict:
+    """Get the ``[logging.output]`` settings from verbose_config.toml"""
+    return {**_DEFAULT_OUTPUT, **_load_config().get("output", {})}
+
+
+def _get_sampling_config() -> dict[str, dict]:
+    """Get the per-logger ``[logging.sampling.<name>]`` settings from verbose_config.toml"""
+    return _load_config().get("sampling", {})
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line.
+
+    Values passed through ``extra`` are kept on the record as-is and only serialized here, i.e. when a
+    handler actually emits the record, so filtered-out or sampled-out records never pay for it.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "lineno": record.lineno,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = record.stack_info
+        return json.dumps(payload, default=_json_default)
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return repr(value)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Thin out high-volume messages of a logger.
+
+    Records are grouped by their message template. Per template, only every ``1 / sample_rate``-th record is
+    kept, and at most ``max_per_second`` records (bursts up to ``burst``) pass. Records above ``max_level``
+    are never dropped. The next record that passes carries the number of dropped ones as ``suppressed``.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        max_per_second: float | None = None,
+        burst: float | None = None,
+        max_level: int | str = logging.INFO,
+    ) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self.burst = burst if burst is not None else max(max_per_second or 0.0, 1.0)
+        self.max_level = logging._checkLevel(max_level)  # type: ignore[attr-defined]
+        self._lock = threading.Lock()
+        self._credit: dict[Any, float] = {}
+        self._buckets: dict[Any, tuple[float, float]] = {}
+        self._suppressed: dict[Any, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        key = record.msg
+        with self._lock:
+            keep = self._sample(key) and self._take_token(key)
+            if not keep:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+    def _sample(self, key: Any) -> bool:
+        if self.sample_rate >= 1.0:
+            return True
+        # The first record of a message is always kept, then one per ``1 / sample_rate`` records.
+        credit = self._credit.get(key, 1.0)
+        if credit >= 1.0:
+            self._credit[key] = credit - 1.0 + self.sample_rate
+            return True
+        self._credit[key] = credit + self.sample_rate
+        return False
+
+    def _take_token(self, key: Any) -> bool:
+        if self.max_per_second is None:
+            return True
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.max_per_second)
+        if tokens < 1.0:
+            self._buckets[key] = (tokens, now)
+            return False
+        self._buckets[key] = (tokens - 1.0, now)
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Hand records to a ``QueueListener`` thread without formatting them on the caller's thread.
+
+    Unlike ``QueueHandler.prepare`` this only merges ``msg % args`` and renders the traceback; ``extra``
+    values are left on the record for the listener's formatter to serialize.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _install_handlers(json_format: bool, use_queue: bool) -> None:
+    """Swap formatters for JSON and move the configured handlers behind a queue so I/O happens off-thread."""
+    for target in (logging.getLogger(), logging.getLogger("aux"), logging.getLogger("aux.console")):
+        handlers = [h for h in target.handlers if not isinstance(h, QueueHandler)]
+        if not handlers:
+            continue
+        if json_format:
+            for handler in handlers:
+                handler.setFormatter(JsonFormatter())
+        if not use_queue:
+            continue
+        record_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(record_queue, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            target.removeHandler(handler)
+        target.addHandler(_DeferredQueueHandler(record_queue))
+        listener.start()
+        _listeners.append(listener)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(shutdown_logging)
 
 
 def configure_logger() -> None:
@@ -37,8 +208,8 @@ def configure_logger() -> None:
     if _logger_configured:
         return
 
+    config = _get_logging_config()
     try:
-        config = _get_logging_config()
         log_to_console = config.get("log_to_console", True)
         log_to_file = config.get("log_to_file", False)
 
@@ -87,6 +258,11 @@ def configure_logger() -> None:
         sys.stderr.write(f"Error in configure_logger: {e}. Using basic config.\n")
         _setup_basic_logging(True)
 
+    try:
+        _install_handlers(json_format=config.get("format") == "json", use_queue=config.get("queue", True))
+    except Exception as e:
+        sys.stderr.write(f"Error installing queue/JSON log handlers: {e}. Logging synchronously.\n")
+
     _logger_configured = True
 
 
@@ -104,6 +280,15 @@ def _setup_basic_logging(log_to_console: bool = True) -> None:
         logging.basicConfig(level=logging.WARNING)
 
 
+def _apply_sampling(logger: Logger, name: str) -> None:
+    """Attach the most specific ``[logging.sampling.<prefix>]`` rule matching ``name``, if any."""
+    rules = _get_sampling_config()
+    matches = [prefix for prefix in rules if name == prefix or name.startswith(prefix + ".")]
+    if not matches or any(isinstance(f, SamplingFilter) for f in logger.filters):
+        return
+    logger.addFilter(SamplingFilter(**rules[max(matches, key=len)]))
+
+
 def get_logger(name: Optional[str] = None) -> Logger:
     """
     Get a logger instance.
@@ -117,7 +302,8 @@ def get_logger(name: Optional[str] = None) -> Logger:
     Returns
     -------
     Logger
-        The configured logger object.
+        The configured logger object. Named loggers are children of the configured ``aux`` loggers,
+        so per-module sampling rules from verbose_config.toml can be applied to them.
     """
     try:
         if not _logger_configured:
@@ -129,13 +315,20 @@ def get_logger(name: Optional[str] = None) -> Logger:
 
         if log_to_file and log_to_console:
             # Use aux.console logger from logging.conf for both console and file output
-            return logging.getLogger("aux.console")
+            base = "aux.console"
         elif log_to_file:
             # Use aux logger from logging.conf for file-only output
-            return logging.getLogger("aux")
+            base = "aux"
+        elif name:
+            base = "aux.console"
         else:
-            name = "aux.console" if name else "root"
-            return logging.getLogger(name)
+            return logging.getLogger("root")
+
+        if not name:
+            return logging.getLogger(base)
+        logger = logging.getLogger(f"{base}.{name}")
+        _apply_sampling(logger, name)
+        return logger
     except Exception as e:
         # Fallback to basic logger if anything fails
         sys.stderr.write(f"Warning: Error getting logger: {e}. Using basic logger.\n")
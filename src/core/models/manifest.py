@@ -2,6 +2,9 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
+# The SDK's hashing, so the server and tools always agree on whether a manifest changed.
+from tool_sdk.core.manifest import hash_manifest, hash_method
+
 
 class MethodSpec(BaseModel):
     name: str = Field(..., description="Method name exposed by the tool")
@@ -9,6 +12,7 @@ class MethodSpec(BaseModel):
     parameters: dict[str, Any] = Field(default_factory=dict, description="JSON Schema for the method parameters")
     path: Optional[str] = Field(default=None, description="Optional explicit HTTP path for this method")
     http_method: Optional[str] = Field(default=None, description="Optional HTTP method if using explicit path")
+    hash: Optional[str] = Field(default=None, description="Content hash of the other fields")
 
 
 class Manifest(BaseModel):
@@ -17,3 +21,16 @@ class Manifest(BaseModel):
     tags: list[str] = []
     base_url: str
     methods: list[MethodSpec] = []
+    hash: Optional[str] = Field(default=None, description="Content hash of the manifest and its method hashes")
+
+    def with_hashes(self) -> "Manifest":
+        """Fill in hashes the client did not send, computed by the tool SDK's own functions.
+
+        Fields left at their defaults are not hashed, so a manifest hashes the same whether or not the client
+        knows about optional fields such as ``tags``.
+        """
+        methods = [m if m.hash else m.model_copy(update={"hash": hash_method(m)}) for m in self.methods]
+        manifest = self.model_copy(update={"methods": methods})
+        if not manifest.hash:
+            manifest.hash = hash_manifest(manifest)
+        return manifest
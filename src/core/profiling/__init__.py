@@ -0,0 +1,4 @@
+# One implementation, shared with the SDK's tool apps.
+from tool_sdk.profiling import Profiler, ProfilerBusy, profiling_router, profiling_router_from_env, sample_stacks
+
+__all__ = ["Profiler", "ProfilerBusy", "profiling_router", "profiling_router_from_env", "sample_stacks"]
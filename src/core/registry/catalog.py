@@ -0,0 +1,162 @@
+import hashlib
+import threading
+import uuid
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Iterable
+
+from core.encoding import dumps
+
+
+@dataclass(frozen=True, eq=False)
+class CatalogVersion:
+    """
+    One immutable version of the catalog.
+
+    Nothing in it changes after it is published, so a reader holding it can take the ETag, a page and the
+    change feed without a lock and without any of them coming from a different version. The full body, the
+    ETag and the name list are computed at most once per version, on first use.
+    """
+
+    version: int
+    epoch: str
+    definitions: dict[str, dict[str, Any]] = field(default_factory=dict)
+    fragments: dict[str, bytes] = field(default_factory=dict)
+    created: dict[str, int] = field(default_factory=dict)
+    changed: dict[str, int] = field(default_factory=dict)
+    removed: dict[str, int] = field(default_factory=dict)
+
+    @cached_property
+    def body(self) -> bytes:
+        return self._join(self.definitions)
+
+    @cached_property
+    def etag(self) -> str:
+        # Derived from the content rather than the version, so every server worker hands out the same ETag for
+        # the same catalog. Weak, because the compression middleware may serve it with different encodings.
+        return f'W/"{hashlib.blake2b(self.body, digest_size=12).hexdigest()}"'
+
+    @cached_property
+    def names(self) -> list[str]:
+        return list(self.definitions)
+
+    def render(self, offset: int = 0, limit: int | None = None, fields: list[str] | None = None) -> bytes:
+        """Serialized ``{name: definition}`` for a page of the catalog, optionally keeping only ``fields``."""
+        if offset == 0 and limit is None and fields is None:
+            return self.body
+        page = self.names[offset : None if limit is None else offset + limit]
+        if fields is None:
+            return self._join(page)
+        return dumps({name: _project(self.definitions[name], fields) for name in page})
+
+    def changes(self, since: int, fields: list[str] | None = None, epoch: str | None = None) -> dict[str, Any]:
+        """Definitions added or updated, and names removed, after version ``since``.
+
+        A ``since`` from another epoch (another worker process, or before a restart) or ahead of the current
+        version cannot be diffed against; the whole catalog is then returned as added with ``reset`` set, and
+        the client should drop what it holds.
+        """
+        reset = since > self.version or (epoch is not None and epoch != self.epoch)
+        if reset:
+            since = 0
+        added: dict[str, Any] = {}
+        updated: dict[str, Any] = {}
+        for name, changed in self.changed.items():
+            if changed <= since:
+                continue
+            definition = self.definitions[name] if fields is None else _project(self.definitions[name], fields)
+            (added if self.created[name] > since else updated)[name] = definition
+        return {
+            "version": self.version,
+            "epoch": self.epoch,
+            "reset": reset,
+            "added": added,
+            "updated": updated,
+            "removed": [] if reset else [name for name, version in self.removed.items() if version > since],
+        }
+
+    def _join(self, names: Iterable[str]) -> bytes:
+        return b"{" + b",".join(dumps(name) + b":" + self.fragments[name] for name in names) + b"}"
+
+
+class Catalog:
+    """
+    Versioned, pre-serialized view of the registry's tool definitions.
+
+    The registry publishes definitions as they change. Each definition is serialized once when it is published
+    and the full catalog body is assembled once per version, so serving ``/tools/definitions`` costs a lookup
+    rather than a copy-and-encode of every entry. ``version`` only moves when a definition is actually added,
+    changed or removed, and every entry remembers the version at which it was created and last changed,
+    which is what the ``since`` change feed is computed from.
+
+    Every change produces a new ``CatalogVersion`` that replaces ``current`` in one assignment; readers that
+    need several answers from the same version should take ``current`` once and ask it.
+    """
+
+    def __init__(self) -> None:
+        # Versions are local to this process; a client passing back another epoch gets a full reset.
+        self.current = CatalogVersion(version=0, epoch=uuid.uuid4().hex[:8])
+        self._write_lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self.current.version
+
+    @property
+    def epoch(self) -> str:
+        return self.current.epoch
+
+    @property
+    def etag(self) -> str:
+        return self.current.etag
+
+    @property
+    def definitions(self) -> dict[str, dict[str, Any]]:
+        """The current definitions; shared with the catalog, so callers must not mutate them."""
+        return self.current.definitions
+
+    @property
+    def names(self) -> list[str]:
+        return self.current.names
+
+    def render(self, offset: int = 0, limit: int | None = None, fields: list[str] | None = None) -> bytes:
+        return self.current.render(offset, limit, fields)
+
+    def changes(self, since: int, fields: list[str] | None = None, epoch: str | None = None) -> dict[str, Any]:
+        return self.current.changes(since, fields, epoch)
+
+    def publish(self, updated: dict[str, dict[str, Any]], removed: Iterable[str] = ()) -> bool:
+        """Record added or changed definitions and removed names. Returns True if the catalog changed."""
+        with self._write_lock:
+            current = self.current
+            changes: dict[str, bytes | None] = {}
+            for name, definition in updated.items():
+                fragment = dumps(definition)
+                if current.fragments.get(name) != fragment:
+                    changes[name] = fragment
+            for name in removed:
+                if name in current.definitions and name not in updated:
+                    changes[name] = None
+            if not changes:
+                return False
+
+            version = current.version + 1
+            definitions, fragments = dict(current.definitions), dict(current.fragments)
+            created, changed, gone = dict(current.created), dict(current.changed), dict(current.removed)
+            for name, fragment in changes.items():
+                if fragment is None:
+                    del definitions[name], fragments[name], created[name], changed[name]
+                    gone[name] = version
+                    continue
+                if name not in definitions:
+                    created[name] = version
+                    gone.pop(name, None)
+                definitions[name] = updated[name]
+                fragments[name] = fragment
+                changed[name] = version
+            self.current = CatalogVersion(version, current.epoch, definitions, fragments, created, changed, gone)
+            return True
+
+
+def _project(definition: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    return {field: definition[field] for field in fields if field in definition}
@@ -1,33 +1,293 @@
+import asyncio
+import contextlib
+import importlib
 import os
-from functools import partial
-from typing import Any, Callable
+import threading
+from typing import Any, Callable, Iterable
+from urllib.parse import urlsplit
 
 import httpx
-from google import genai
-from google.genai import types
+import numpy as np
+import orjson
+from numpy import ndarray
 
 from core import get_logger
+from core.registry.catalog import Catalog
+from core.registry.snapshot import RegistryState
 from core.vec_db import VectorDB
 
-client = genai.Client(api_key=os.getenv("API_KEY"))
+logger = get_logger(__name__)
 
+_client: Any = None
 
-logger = get_logger(__name__)
+
+def get_genai_client() -> Any:
+    """Create the Gemini client on first use; importing ``google.genai`` alone takes ~0.5s."""
+    global _client
+    if _client is None:
+        from google import genai
+
+        _client = genai.Client(api_key=os.getenv("API_KEY"))
+    return _client
+
+
+INPROCESS_URL = "inprocess://local"
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _uds_path(base_url: str) -> str | None:
+    """Socket path of a ``unix:///path/to.sock`` base URL, None for regular URLs."""
+    if base_url.startswith("unix:"):
+        return urlsplit(base_url).path
+    return None
+
+
+def _transport(base_url: str) -> str:
+    return "uds" if _uds_path(base_url) else "http"
+
+
+def load_tool_functions(spec: str) -> list[Callable]:
+    """Resolve ``module`` (every ``@mcp_tool`` function in it) or ``module:attribute`` (a function or list)."""
+    module_name, _, attribute = spec.strip().partition(":")
+    module = importlib.import_module(module_name)
+    if attribute:
+        target = getattr(module, attribute)
+        return [target] if callable(target) else list(target)
+    return [value for value in vars(module).values() if callable(value) and hasattr(value, "__mcp_tool_meta__")]
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _definition(entry: dict[str, Any]) -> dict[str, Any]:
+    """The public part of a registry entry, as served by ``/tools/definitions``."""
+    return {key: value for key, value in entry.items() if key != "callable"}
 
 
 class Registry:
+    """
+    Tools by name, their catalog and their embedding index.
+
+    ``tool_registry``, ``catalog.current`` and the vector index are immutable snapshots: a registration builds
+    the next version of each aside and swaps it in with one reference assignment, so readers on any thread
+    (tool calls and searches run in thread pools) take no lock and never see a half-registered tool. Writers
+    are serialized by one lock.
+    """
+
     def __init__(self, name: str):
         logger.debug("Initializing registry", extra={"registry_name": name})
+        # Replaced, never mutated; read it once per lookup.
         self.tool_registry: dict[str, dict[str, Any]] = {}
+        # Bumped on every registration so callers can invalidate anything derived from the registry.
+        self.version = 0
+        self.catalog = Catalog()
+        self._tool_methods: dict[str, set[str]] = {}
+        # Manifests of HTTP tools as registered, kept for snapshots.
+        self._manifests: dict[str, dict[str, Any]] = {}
         self._model = "gemini-embedding-001"
-        self.config = types.EmbedContentConfig(task_type="SEMANTIC_SIMILARITY")
-        self._vec_db = VectorDB(
-            embedding_function=partial(
-                client.models.embed_content,
-                model=self._model,
-                config=self.config,
+        self._embed_config: Any = None
+        # One pooled client for TCP tools (key None) and one per Unix domain socket.
+        self._http_clients: dict[str | None, httpx.Client] = {}
+        self._vec_db = VectorDB(embedding_function=self._embed_content)
+        self._index_queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+        self._indexer: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Reentrant: restoring and mounting register tools while holding it.
+        self._write_lock = threading.RLock()
+        # Description currently embedded in the vector index for each key.
+        self._embedded: dict[str, str] = {}
+        # (description, key) pairs waiting in the queue or being embedded; a pair is never queued twice.
+        self._queued: set[tuple[str, str]] = set()
+        self._pending = 0
+        self._indexed = 0
+        # Keys whose last embedding attempt failed, with their attempt count; each is retried with backoff.
+        self._failed: dict[str, int] = {}
+        self._retries: dict[str, asyncio.TimerHandle] = {}
+        self.retry_backoff = 0.5
+        self.max_retry_backoff = 60.0
+
+    def _get_http_client(self, socket_path: str | None = None) -> httpx.Client:
+        """Shared, thread-safe client for tool proxies; building one per call costs ~40ms of SSL setup."""
+        client = self._http_clients.get(socket_path)
+        if client is None:
+            transport = httpx.HTTPTransport(uds=socket_path) if socket_path else None
+            # Compressing traffic that never leaves the host only costs CPU on both ends.
+            headers = {"Accept-Encoding": "identity"} if socket_path else None
+            client = httpx.Client(
+                timeout=30.0, limits=httpx.Limits(max_connections=100), transport=transport, headers=headers
             )
-        )
+            client = self._http_clients.setdefault(socket_path, client)
+        return client
+
+    def _embed_content(self, contents: str | list[str]) -> Any:
+        if self._embed_config is None:
+            from google.genai import types
+
+            self._embed_config = types.EmbedContentConfig(task_type="SEMANTIC_SIMILARITY")
+        return get_genai_client().models.embed_content(model=self._model, contents=contents, config=self._embed_config)
+
+    def _enqueue_index(self, description: str, key: str) -> None:
+        """Queue a description for embedding; the indexer task picks it up once the server is running."""
+        if (description, key) in self._queued:
+            return
+        self._queued.add((description, key))
+        self._pending += 1
+        loop = self._loop
+        if loop is None or loop.is_closed() or _running_loop() is loop:
+            self._index_queue.put_nowait((description, key))
+        else:
+            # asyncio queues are not thread-safe; registrations from other threads hand over to the loop.
+            loop.call_soon_threadsafe(self._index_queue.put_nowait, (description, key))
+
+    async def _run_indexer(self) -> None:
+        while True:
+            batch = [await self._index_queue.get()]
+            while not self._index_queue.empty():
+                batch.append(self._index_queue.get_nowait())
+            try:
+                # Submitted together so the embedding dispatcher coalesces them into batched provider calls.
+                vectors = await asyncio.gather(*(self._embed_one(description, key) for description, key in batch))
+                self._publish_index(batch, vectors)
+            except Exception:
+                # Keep indexing; the batch is retried like a failed embedding.
+                logger.exception("Failed to add embeddings to the index", extra={"batch_size": len(batch)})
+                for description, key in batch:
+                    self._retry_later(description, key)
+            finally:
+                with self._write_lock:
+                    self._queued.difference_update(batch)
+                    self._pending -= len(batch)
+                    # A registration deduplicated against this batch may have been dropped as stale by it; queue
+                    # whatever is still missing. Keys waiting for a retry keep their backoff.
+                    for key in {key for _, key in batch} - self._retries.keys():
+                        entry = self.tool_registry.get(key)
+                        if entry is not None and entry["description"] and self._needs_index(entry["description"], key):
+                            self._enqueue_index(entry["description"], key)
+                for _ in batch:
+                    self._index_queue.task_done()
+
+    def _needs_index(self, description: str, key: str) -> bool:
+        # Skip descriptions that were re-registered away while they sat in the queue, and ones whose
+        # embedding was restored from a snapshot.
+        entry = self.tool_registry.get(key)
+        return entry is not None and entry["description"] == description and self._embedded.get(key) != description
+
+    async def _embed_one(self, description: str, key: str) -> ndarray | None:
+        try:
+            if self._needs_index(description, key):
+                return await self._vec_db.dispatcher.embed(description)
+        except Exception:
+            logger.exception("Failed to index tool description", extra={"tool_name": key})
+            self._retry_later(description, key)
+        return None
+
+    def _retry_later(self, description: str, key: str) -> None:
+        """Queue ``key`` again after an exponential backoff; it counts as failed until then."""
+        attempts = self._failed.get(key, 0) + 1
+        self._failed[key] = attempts
+        delay = min(self.retry_backoff * 2 ** (attempts - 1), self.max_retry_backoff)
+        previous = self._retries.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+        self._retries[key] = asyncio.get_running_loop().call_later(delay, self._retry, description, key)
+
+    def _retry(self, description: str, key: str) -> None:
+        self._retries.pop(key, None)
+        with self._write_lock:
+            if self._needs_index(description, key):
+                self._enqueue_index(description, key)
+            else:
+                # Re-registered meanwhile; the new description was queued on its own.
+                self._failed.pop(key, None)
+
+    def _forget_failure(self, key: str) -> None:
+        self._failed.pop(key, None)
+        handle = self._retries.pop(key, None)
+        if handle is None:
+            return
+        if self._loop is not None and _running_loop() is not self._loop:
+            # Registrations may run on other threads; timer handles belong to the loop.
+            self._loop.call_soon_threadsafe(handle.cancel)
+        else:
+            handle.cancel()
+
+    def _publish_index(self, batch: list[tuple[str, str]], vectors: list[ndarray | None]) -> None:
+        """Add a batch of embeddings to the index as one new version."""
+        with self._write_lock:
+            # Registrations may have landed while the batch was being embedded; a key queued twice keeps the
+            # embedding of its current description.
+            fresh: dict[str, tuple[str, ndarray]] = {}
+            for (description, key), vector in zip(batch, vectors, strict=True):
+                if vector is not None and self._needs_index(description, key):
+                    fresh[key] = (description, vector)
+            if not fresh:
+                return
+            matrix = np.vstack([vector for _, vector in fresh.values()])
+            index = self._vec_db.snapshot
+            if len(index) and index.vectors.shape[1] != matrix.shape[1]:
+                # The embedding model changed under the index (e.g. vectors restored from an older deployment);
+                # start a new index and embed everything else again.
+                stale = [key for key in index.metadata if key not in fresh]
+                logger.warning(
+                    "Embedding dimension changed; rebuilding the index",
+                    extra={"dimension": matrix.shape[1], "previous_dimension": index.vectors.shape[1]},
+                )
+                self._vec_db.replace(list(fresh), matrix)
+                for key in stale:
+                    self._embedded.pop(key, None)
+                    entry = self.tool_registry.get(key)
+                    if entry is not None and entry["description"]:
+                        self._enqueue_index(entry["description"], key)
+            else:
+                self._vec_db.load(list(fresh), matrix)
+            self._embedded.update((key, description) for key, (description, _) in fresh.items())
+            self._indexed += len(fresh)
+            for key in fresh:
+                self._failed.pop(key, None)
+
+    def start_indexing(self) -> None:
+        """Start the background indexer on the running event loop."""
+        if self._indexer is None or self._indexer.done():
+            self._loop = asyncio.get_running_loop()
+            self._indexer = asyncio.create_task(self._run_indexer())
+            # Retries scheduled by a previous run (e.g. before a leadership change) were cancelled with it.
+            for key in list(self._failed):
+                entry = self.tool_registry.get(key)
+                if entry is not None and self._needs_index(entry["description"], key):
+                    self._enqueue_index(entry["description"], key)
+                else:
+                    self._failed.pop(key, None)
+
+    async def stop_indexing(self) -> None:
+        if self._indexer is not None:
+            self._indexer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._indexer
+            for handle in self._retries.values():
+                handle.cancel()
+            self._retries.clear()
+            self._indexer = None
+            self._loop = None
+
+    async def wait_until_indexed(self) -> None:
+        await self._index_queue.join()
+
+    @property
+    def index_ready(self) -> bool:
+        """True while the indexer runs and every registered description is embedded (none pending or failed)."""
+        return self._indexer is not None and not self._indexer.done() and self._pending == 0 and not self._failed
+
+    def indexing_status(self) -> dict[str, int | bool]:
+        return {
+            "running": self._indexer is not None and not self._indexer.done(),
+            "pending": self._pending,
+            "indexed": self._indexed,
+            "failed": len(self._failed),
+        }
 
     def core_tool(self, name: str | None = None, tags: list[str] | None = None, **meta: Any) -> Callable:
         def decorator(func: Callable) -> Callable:
@@ -39,55 +299,134 @@ class Registry:
                 "callable": func,
                 **meta,
             }
-            self.tool_registry[meta_entry["name"]] = meta_entry
+            with self._write_lock:
+                self.tool_registry = {**self.tool_registry, meta_entry["name"]: meta_entry}
+                self.version += 1
+                self.catalog.publish({meta_entry["name"]: _definition(meta_entry)})
+                self._enqueue_index(meta_entry["description"], meta_entry["name"])
             logger.debug(
                 "Registered tool with metadata",
                 extra={"meta_entry": meta_entry, "tool_name": meta_entry["name"]},
             )
-            try:
-                self._vec_db.add([meta_entry["description"]])
-            except Exception:
-                logger.exception("Failed to index tool description")
 
             return func
 
         return decorator
 
-    def register_tool(self, tool_data: dict) -> None:
-        required = ["name", "base_url"]
-        for k in required:
-            if k not in tool_data:
-                raise ValueError(f"Manifest missing required field: {k}")
+    def register_tool(self, tool_data: dict, callables: dict[str, Callable] | None = None) -> None:
+        """Register a tool manifest.
+
+        Methods are reached through HTTP proxies to ``base_url`` (``unix:///path.sock`` for a Unix domain
+        socket). With ``callables``, they are bound and called in-process instead; every method of the
+        manifest needs one, and a ``ValueError`` names those that have none.
+        """
+        self._register([(tool_data, callables)])
+
+    def register_tools(self, manifests: Iterable[dict]) -> None:
+        """Register several HTTP tool manifests as one change.
+
+        The registry and the catalog are copied and published once for the whole batch rather than once per
+        manifest, which keeps restoring a snapshot or catching up with other workers linear in the number of
+        tools.
+        """
+        self._register([(tool_data, None) for tool_data in manifests])
+
+    def _register(self, batch: list[tuple[dict, dict[str, Callable] | None]]) -> None:
+        for tool_data, callables in batch:
+            for k in ("name", "base_url"):
+                if k not in tool_data:
+                    raise ValueError(f"Manifest missing required field: {k}")
+            if callables is not None:
+                # A method without a callable would silently fall back to an HTTP proxy for an in-process tool.
+                missing = sorted(
+                    m["name"] for m in tool_data.get("methods", []) if m.get("name") and m["name"] not in callables
+                )
+                if missing:
+                    raise ValueError(f"Tool '{tool_data['name']}' is missing callables for methods: {missing}")
 
+        with self._write_lock:
+            entries = dict(self.tool_registry)
+            published: dict[str, dict[str, Any]] = {}
+            removed: set[str] = set()
+            # Queued once the new entries are published, so the indexer never finds them missing.
+            to_index: list[tuple[str, str]] = []
+            changed = False
+            for tool_data, callables in batch:
+                changed |= self._apply_manifest(entries, tool_data, callables, published, removed, to_index)
+            if changed:
+                # A method dropped by one manifest of the batch may be registered again by a later one.
+                removed -= entries.keys()
+                if removed:
+                    self._vec_db.remove(removed)
+                self.tool_registry = entries
+                self.catalog.publish(published, removed)
+                self.version += 1
+            for item in to_index:
+                self._enqueue_index(*item)
+
+    def _apply_manifest(
+        self,
+        entries: dict[str, dict[str, Any]],
+        tool_data: dict,
+        callables: dict[str, Callable] | None,
+        published: dict[str, dict[str, Any]],
+        removed: set[str],
+        to_index: list[tuple[str, str]],
+    ) -> bool:
+        """Register one manifest into ``entries``, a private copy of the registry.
+
+        Definitions to publish, names to remove and descriptions to embed are collected into ``published``,
+        ``removed`` and ``to_index``. Returns False if the manifest was already registered unchanged.
+        """
         tool_name = tool_data["name"]
         tags = tool_data.get("tags", [])
         description = tool_data.get("description", "")
         base_url = tool_data["base_url"].rstrip("/")
         methods = tool_data.get("methods", [])
 
+        def _make_proxy(method_name: str, path: str | None = None, http_method: str | None = None) -> Callable:
+            socket_path = _uds_path(base_url)
+            url_base = "http://localhost" if socket_path else base_url
+
+            def _proxy(*args: Any, **kwargs: Any) -> Any:
+                payload: dict[str, Any] = {"method": method_name, "args": list(args), "kwargs": kwargs}
+                client_http = self._get_http_client(socket_path)
+                target_path = path or f"/invoke/{method_name}"
+                url = f"{url_base}{target_path}"
+                method = (http_method or "POST").upper()
+                if method == "GET":
+                    resp = client_http.get(url, params=payload)
+                else:
+                    resp = client_http.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+                resp.raise_for_status()
+                data = orjson.loads(resp.content)
+                return data.get("result", data)
+
+            return _proxy
+
+        previous = entries.get(tool_name)
+        manifest_hash = tool_data.get("hash")
+        if manifest_hash and callables is None and previous is not None and previous.get("hash") == manifest_hash:
+            # Nothing to register, but descriptions whose embedding never made it into the index (e.g. the
+            # embedding call failed) get another chance.
+            unindexed = [
+                (entries[key]["description"], key)
+                for key in (tool_name, *sorted(self._tool_methods.get(tool_name, ())))
+                if entries[key]["description"] and self._embedded.get(key) != entries[key]["description"]
+            ]
+            to_index.extend(unindexed)
+            logger.info(
+                "Tool manifest unchanged; nothing to register",
+                extra={"tool_name": tool_name, "requeued": len(unindexed)},
+            )
+            return False
+
         if not methods:
             logger.warning(
                 "Tool registered without methods; only metadata stored.",
                 extra={"tool_name": tool_name},
             )
 
-        def _make_proxy(method_name: str, path: str | None = None, http_method: str | None = None) -> Callable:
-            def _proxy(*args: Any, **kwargs: Any) -> Any:
-                payload = {"method": method_name, "args": list(args), "kwargs": str(kwargs)}
-                with httpx.Client(timeout=30.0) as client_http:
-                    target_path = path or f"/invoke/{method_name}"
-                    url = f"{base_url}{target_path}"
-                    method = (http_method or "POST").upper()
-                    if method == "GET":
-                        resp = client_http.get(url, params=payload)
-                    else:
-                        resp = client_http.post(url, json=payload)
-                    resp.raise_for_status()
-                    data = resp.json()
-                    return data.get("result", data)
-
-            return _proxy
-
         meta_entry = {
             "name": tool_name,
             "title": tool_name,
@@ -98,27 +437,50 @@ class Registry:
                 "version": tool_data.get("version"),
                 "methods": [m.get("name") for m in methods],
             },
-            "external": True,
+            "external": not callables,
+            "transport": "inprocess" if callables else _transport(base_url),
             "base_url": base_url,
             "version": tool_data.get("version"),
+            "hash": manifest_hash,
         }
-        self.tool_registry[tool_name] = meta_entry
+        entries[tool_name] = meta_entry
+        if callables:
+            self._manifests.pop(tool_name, None)
+        else:
+            self._manifests[tool_name] = tool_data
+        published[tool_name] = _definition(meta_entry)
+        # Method entries copy these from the tool; while they hold, a method with an unchanged hash is reusable.
+        shared_unchanged = previous is not None and all(
+            previous.get(key) == meta_entry[key] for key in ("tags", "transport", "base_url", "version")
+        )
 
         logger.debug("Registered tool metadata", extra={"meta_entry": meta_entry})
 
-        if description:
-            try:
-                self._vec_db.add(description, tool_name)
-            except Exception as e:
-                logger.warning("Failed to index tool description", extra={"tool_name": tool_name, "exception": e})
+        if description and (previous is None or previous["description"] != description):
+            to_index.append((description, tool_name))
 
         logger.info("Registered external tool", extra={"tool_name": tool_name, "base_url": base_url})
 
+        current: set[str] = set()
+        reused = 0
         for m in methods:
             m_name = m.get("name")
             if not m_name:
                 continue
             fq_name = f"{tool_name}.{m_name}"
+            current.add(fq_name)
+            local = (callables or {}).get(m_name)
+            existing = entries.get(fq_name)
+            m_hash = m.get("hash")
+            if (
+                shared_unchanged
+                and local is None
+                and m_hash
+                and existing is not None
+                and existing.get("hash") == m_hash
+            ):
+                reused += 1
+                continue
             m_desc = m.get("description") or f"Proxy to {tool_name}.{m_name}"
             m_path = m.get("path")
             m_http = m.get("http_method")
@@ -129,35 +491,140 @@ class Registry:
                 "description": m_desc,
                 "parameters": m_params,
                 "tags": tags,
-                "callable": _make_proxy(m_name, path=m_path, http_method=m_http),
-                "external": True,
+                "callable": local or _make_proxy(m_name, path=m_path, http_method=m_http),
+                "external": local is None,
+                "transport": "inprocess" if local else _transport(base_url),
                 "base_url": base_url,
                 "version": tool_data.get("version"),
+                "hash": m_hash,
             }
-            self.tool_registry[fq_name] = entry
+            entries[fq_name] = entry
+            published[fq_name] = _definition(entry)
             logger.debug("Registered method proxy", extra={"fq_name": fq_name})
-            if m_desc:
-                try:
-                    self._vec_db.add(m_desc, fq_name)
-                except Exception:
-                    logger.exception("Failed to index method description", extra={"method_name": fq_name})
+            # Only new or reworded descriptions cost an embedding call.
+            if m_desc and (existing is None or existing["description"] != m_desc):
+                to_index.append((m_desc, fq_name))
+
+        # Methods dropped from a re-registered manifest disappear from the registry and the index.
+        stale = self._tool_methods.get(tool_name, set()) - current
+        for fq_name in stale:
+            del entries[fq_name]
+            published.pop(fq_name, None)
+            self._embedded.pop(fq_name, None)
+            self._forget_failure(fq_name)
+        if stale:
+            removed |= stale
+            logger.info("Removed stale methods", extra={"tool_name": tool_name, "methods": sorted(stale)})
+        if reused:
+            logger.info("Kept unchanged methods", extra={"tool_name": tool_name, "methods_reused": reused})
+        self._tool_methods[tool_name] = current
+        return True
+
+    def register_local(self, tool: Callable | Iterable[Callable]) -> list[str]:
+        """Mount SDK tool functions (decorated with ``@mcp_tool``) into this process.
+
+        Manifests are built exactly as ``create_app`` builds them, but methods are bound to the functions
+        themselves, so calls skip HTTP and JSON entirely. Returns the registered tool names.
+        """
+        try:
+            from tool_sdk import build_manifests  # type: ignore[attr-defined]
+        except ImportError as e:
+            raise ImportError("Mounting in-process tools requires the tool_sdk package") from e
+
+        manifests, method_map = build_manifests(tool, INPROCESS_URL)
+        for manifest in manifests:
+            callables = {m.name: method_map[m.name] for m in manifest.methods}
+            self.register_tool(manifest.model_dump(), callables=callables)
+            logger.info("Mounted in-process tool", extra={"tool_name": manifest.name})
+        return [manifest.name for manifest in manifests]
+
+    def export_state(self) -> RegistryState:
+        """Capture HTTP tool manifests and the embedding index for a snapshot.
+
+        In-process tools are left out: their callables cannot be persisted, and they are mounted again at boot.
+        """
+        with self._write_lock:
+            keys, vectors = self._vec_db.export()
+            rows = [i for i, key in enumerate(keys) if key in self._embedded]
+            return RegistryState(
+                version=self.version,
+                manifests=list(self._manifests.values()),
+                keys=[keys[i] for i in rows],
+                descriptions=[self._embedded[keys[i]] for i in rows],
+                vectors=vectors[rows] if len(rows) != len(keys) else vectors,
+                model=self._model,
+            )
+
+    def export_manifests(self) -> dict[str, dict[str, Any]]:
+        with self._write_lock:
+            return dict(self._manifests)
+
+    def follow_index(self, keys: list[str], descriptions: list[str], vectors: ndarray) -> None:
+        """Replace the vector index with one built elsewhere (row i of ``vectors`` embeds ``descriptions[i]``).
+
+        Used by workers that share another process's index instead of running their own indexer.
+        """
+        with self._write_lock:
+            self._vec_db.replace(keys, vectors)
+            self._embedded = dict(zip(keys, descriptions, strict=True))
+
+    def restore_state(self, state: RegistryState) -> None:
+        """Re-register snapshotted manifests and load their embeddings, so nothing needs re-embedding.
+
+        Embeddings are only kept for keys that are registered with the same description they were computed
+        from, by the same embedding model; anything else is embedded again by the indexer as usual.
+        """
+        with self._write_lock:
+            self.register_tools(state.manifests)
+            index = self._vec_db.snapshot
+            if state.model != self._model or (
+                len(index) and len(state.keys) and index.vectors.shape[1] != state.vectors.shape[1]
+            ):
+                logger.warning(
+                    "Discarding snapshot embeddings from another embedding model",
+                    extra={"snapshot_model": state.model, "model": self._model, "vectors": len(state.keys)},
+                )
+                rows = []
+            else:
+                rows = [
+                    i
+                    for i, (key, description) in enumerate(zip(state.keys, state.descriptions, strict=True))
+                    if self.tool_registry.get(key, {}).get("description") == description
+                ]
+            keys = [state.keys[i] for i in rows]
+            self._vec_db.load(keys, state.vectors[rows] if len(rows) != len(state.keys) else state.vectors)
+            self._embedded.update((key, state.descriptions[i]) for key, i in zip(keys, rows, strict=True))
+            self.version = max(self.version, state.version)
+        logger.info(
+            "Restored registry snapshot",
+            extra={"tools": len(state.manifests), "vectors": len(keys), "stale_vectors": len(state.keys) - len(keys)},
+        )
+
+    @property
+    def index_version(self) -> tuple[int, int]:
+        """Changes whenever the registry or the vector index changes (e.g. a queued description got embedded)."""
+        return self.version, self._vec_db.version
 
     def list_tools(self) -> list[str]:
         return self._get_tool_names()
 
     def call_tool(self, name: str, *args: Any, **kwargs: Any) -> dict[str, Any]:
-        if name not in self.tool_registry:
+        entry = self.tool_registry.get(name)
+        if entry is None:
             raise KeyError(f"Tool '{name}' not registered")
-        return self.tool_registry[name]["callable"](*args, **kwargs)
+        return entry["callable"](*args, **kwargs)
 
     def _get_tool_names(self) -> list[str]:
         return list(self.tool_registry.keys())
 
     def get_tool_definitions(self) -> dict[str, dict[str, Any]]:
-        defs = {}
-        for k, v in self.tool_registry.items():
-            defs[k] = {key: val for key, val in v.items() if key != "callable"}
-        return defs
+        return dict(self.catalog.definitions)
+
+    async def aembed_query(self, text: str) -> ndarray:
+        return await self._vec_db.dispatcher.embed(text)
+
+    def query_tools_by_vector(self, vector: ndarray, top_k: int = 5) -> list[dict]:
+        return self._vec_db.query(vector, top_k=top_k)
 
     def query_tools_by_description(self, description: str, top_k: int = 5) -> list[dict]:
         return self._vec_db.text_query(description, top_k=top_k)
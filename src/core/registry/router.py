@@ -1,9 +1,15 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
 
 from core import get_logger
+from core.admission import AdmissionController, AdmissionRejected, Priority
+from core.blobs import BlobNotFound, BlobStore
+from core.encoding import FastJSONResponse
 from core.models.manifest import Manifest
 from core.registry.registry import registry as tool_registry
 
@@ -12,34 +18,89 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+admission = AdmissionController.from_env()
+# Proxies do blocking HTTP; run them off the event loop with one thread per admitted call.
+_tool_executor = ThreadPoolExecutor(max_workers=admission.max_concurrency, thread_name_prefix="tool-call")
+
 
 class ToolCallRequest(BaseModel):
     tool_name: str
     args: list[Any] = []
     kwargs: dict[str, Any] = {}
+    priority: Priority = Priority.INTERACTIVE
+    queue_timeout_ms: float | None = Field(default=None, gt=0)
+
+
+@router.get("/tools/definitions", response_model=dict[str, dict[str, Any]])
+async def get_tool_definitions(
+    request: Request,
+    since: int | None = Query(None, ge=0, description="Return only changes after this catalog version"),
+    epoch: str | None = Query(None, description="Catalog epoch the `since` version was read from"),
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1),
+    fields: str | None = Query(None, description="Comma-separated definition fields to keep, e.g. name,description"),
+) -> Response:
+    # One immutable version answers the whole request, even if a registration lands meanwhile.
+    catalog = tool_registry.catalog.current
+    headers = {"ETag": catalog.etag, "X-Catalog-Version": str(catalog.version), "X-Catalog-Epoch": catalog.epoch}
+    if _etag_matches(request.headers.get("if-none-match"), catalog.etag):
+        return Response(status_code=304, headers=headers)
+
+    projection = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    if since is not None:
+        return FastJSONResponse(catalog.changes(since, projection, epoch), headers=headers)
 
+    headers["X-Total-Count"] = str(len(catalog.names))
+    if limit is not None and offset + limit < len(catalog.names):
+        headers["X-Next-Offset"] = str(offset + limit)
+    return Response(catalog.render(offset, limit, projection), media_type="application/json", headers=headers)
 
-@router.get("/tools/definitions")
-async def get_tool_definitions() -> list[dict[str, Any]]:
-    return tool_registry.get_tool_definitions()
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
 
-@router.post("/tools/call")
-async def call_tool(request: ToolCallRequest) -> dict[str, Any]:
+
+@router.post("/tools/call", response_model=dict[str, Any])
+async def call_tool(request: ToolCallRequest, http_request: Request) -> FastJSONResponse:
+    queue_timeout = request.queue_timeout_ms / 1000.0 if request.queue_timeout_ms is not None else None
+    store: BlobStore | None = getattr(http_request.app.state, "blob_store", None)
+    entry = tool_registry.tool_registry.get(request.tool_name)
     try:
-        result = tool_registry.call_tool(request.tool_name, *request.args, **request.kwargs)
-        return {"result": result}
+        async with admission.slot(request.tool_name, request.priority, queue_timeout):
+            # Blob handles travel to HTTP tools as they are and are resolved there; in-process tools get values.
+            if store is not None and entry is not None and not entry.get("external"):
+                call = partial(_call_with_blobs, store, request)
+            else:
+                call = partial(tool_registry.call_tool, request.tool_name, *request.args, **request.kwargs)
+            result = await asyncio.get_running_loop().run_in_executor(_tool_executor, call)
+        return FastJSONResponse({"result": result})
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except BlobNotFound as e:
+        raise HTTPException(status_code=404, detail=f"Blob {e} not found or expired")
     except Exception as e:
         logger.error("Error calling tool", extra={"tool_name": request.tool_name, "exception": e})
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _call_with_blobs(store: BlobStore, request: ToolCallRequest) -> Any:
+    args, kwargs = store.resolve(request.args), store.resolve(request.kwargs)
+    return store.offload(tool_registry.call_tool(request.tool_name, *args, **kwargs))
+
+
 @router.post("/register")
 async def register_tool_(request: Request) -> dict[str, str]:
     logger.info("Received tool registration request")
     payload = await request.json()
-    manifest = Manifest.model_validate(payload)
-    logger.info("Tool registration", extra={"payload": payload})
-    tool_registry.register_tool(manifest.model_dump())
+    manifest = Manifest.model_validate(payload).with_hashes()
+    logger.debug("Tool registration", extra={"payload": payload})
+    tool_data = manifest.model_dump()
+    tool_registry.register_tool(tool_data)
+    shared = getattr(request.app.state, "shared_registry", None)
+    if shared is not None:
+        shared.publish_manifest(tool_data)
     logger.info("Tool registered", extra={"tool_name": manifest.name})
     return {"status": "ok"}
@@ -0,0 +1,205 @@
+import asyncio
+import contextlib
+import fcntl
+import json
+import os
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, IO, TYPE_CHECKING
+
+import numpy as np
+
+from core import get_logger
+
+if TYPE_CHECKING:
+    from core.registry.registry import Registry
+
+logger = get_logger(__name__)
+
+_DATABASE = "shared.sqlite"
+_KEEP_GENERATIONS = 3
+
+
+class SharedRegistry:
+    """
+    Keep the registries of several server worker processes on one node in sync.
+
+    Registrations are written to a SQLite database in ``directory`` that every worker polls for changes
+    (``PRAGMA data_version`` makes an idle poll nearly free), so a ``/register`` landing on any worker reaches
+    all of them within one poll interval.
+
+    Exactly one worker, the leader, holds an exclusive lock on the directory and runs the embedding indexer.
+    It publishes each new version of the index as an immutable ``.npy`` generation that the followers
+    memory-map read-only. With ``directory`` on a tmpfs such as ``/dev/shm``, every worker searches the same
+    physical pages and no worker embeds a description another one already embedded. When the leader exits,
+    its lock is released and the next follower to poll takes over.
+    """
+
+    def __init__(self, registry: "Registry", directory: str | Path, poll_interval: float = 0.1) -> None:
+        """Initialize the shared state.
+        Args:
+            registry (Registry): This worker's registry.
+            directory (str | Path): Directory shared by all workers of the node; created if missing.
+            poll_interval (float): Seconds between checks for changes made by other workers.
+        """
+        self.registry = registry
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self.leader = False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.directory / _DATABASE, timeout=10.0, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS manifests (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL, manifest TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS generations (
+                gen INTEGER PRIMARY KEY AUTOINCREMENT,
+                vectors_file TEXT NOT NULL,
+                rows TEXT NOT NULL,
+                ready INTEGER NOT NULL,
+                created REAL NOT NULL
+            );
+            """
+        )
+        self._lock_file: IO[bytes] | None = None
+        self._data_version: int | None = None
+        self._seq = 0
+        self._gen = 0
+        self._ready = False
+        self._published: tuple[tuple[int, int], bool] | None = None
+
+    @classmethod
+    def from_env(cls, registry: "Registry") -> "SharedRegistry | None":
+        directory = os.getenv("SHARED_STATE_DIR")
+        if not directory:
+            return None
+        return cls(registry, directory, poll_interval=float(os.getenv("SHARED_STATE_POLL_MS", "100")) / 1000.0)
+
+    @property
+    def index_ready(self) -> bool:
+        if self.leader:
+            return self.registry.index_ready
+        return self._ready
+
+    def status(self) -> dict[str, Any]:
+        return {"role": "leader" if self.leader else "follower", "generation": self._gen}
+
+    def publish_manifest(self, tool_data: dict[str, Any]) -> None:
+        """Share a manifest this worker registered with the other workers."""
+        self._db.execute(
+            "REPLACE INTO manifests (name, manifest) VALUES (?, ?)", (tool_data["name"], json.dumps(tool_data))
+        )
+
+    def start(self) -> None:
+        """Catch up with the shared state and take the leadership if it is free. Call before serving."""
+        self._sync_manifests()
+        self._load_generation()
+        if self._try_lead():
+            # The leader may have restored manifests from a snapshot that the shared store has never seen.
+            known = {name for (name,) in self._db.execute("SELECT name FROM manifests")}
+            for name, manifest in self.registry.export_manifests().items():
+                if name not in known:
+                    self.publish_manifest(manifest)
+        self._data_version = self._current_data_version()
+
+    async def run(self) -> None:
+        """Poll for changes until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Failed to sync shared registry state")
+
+    async def sync(self) -> None:
+        if not self.leader:
+            self._try_lead()
+        data_version = self._current_data_version()
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._sync_manifests()
+            if not self.leader:
+                self._load_generation()
+        if self.leader:
+            await self._publish_generation()
+
+    def close(self) -> None:
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+            self.leader = False
+        self._db.close()
+
+    def _current_data_version(self) -> int:
+        return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def _try_lead(self) -> bool:
+        if self.leader:
+            return True
+        lock_file = open(self.directory / "leader.lock", "wb")  # noqa: SIM115
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        self.leader = True
+        logger.info("Worker is the shared registry leader", extra={"pid": os.getpid()})
+        # Whatever this worker was following is now its own index; only what is missing gets embedded.
+        self.registry.start_indexing()
+        return True
+
+    def _sync_manifests(self) -> None:
+        rows = self._db.execute(
+            "SELECT seq, manifest FROM manifests WHERE seq > ? ORDER BY seq", (self._seq,)
+        ).fetchall()
+        if not rows:
+            return
+        # Manifests carry hashes, so the ones this worker registered itself are no-ops.
+        self.registry.register_tools(json.loads(manifest) for _, manifest in rows)
+        self._seq = rows[-1][0]
+
+    def _load_generation(self) -> None:
+        row = self._db.execute(
+            "SELECT gen, vectors_file, rows, ready FROM generations ORDER BY gen DESC LIMIT 1"
+        ).fetchone()
+        if row is None or row[0] == self._gen:
+            return
+        gen, vectors_file, rows, ready = row
+        try:
+            vectors = np.load(self.directory / vectors_file, mmap_mode="r")
+        except FileNotFoundError:
+            return  # Superseded while we looked; the next poll picks up the newer one.
+        keys, descriptions = json.loads(rows)
+        self.registry.follow_index(keys, descriptions, vectors)
+        self._gen, self._ready = gen, bool(ready)
+
+    async def _publish_generation(self) -> None:
+        marker = (self.registry.index_version, self.registry.index_ready)
+        if marker == self._published:
+            return
+        state = self.registry.export_state()
+        vectors_file = f"index-{uuid.uuid4().hex[:12]}.npy"
+        await asyncio.to_thread(
+            np.save, self.directory / vectors_file, np.ascontiguousarray(state.vectors, dtype=np.float32)
+        )
+        self._db.execute(
+            "INSERT INTO generations (vectors_file, rows, ready, created) VALUES (?, ?, ?, ?)",
+            (vectors_file, json.dumps([state.keys, state.descriptions]), int(marker[1]), time.time()),
+        )
+        self._published = marker
+        self._prune_generations()
+
+    def _prune_generations(self) -> None:
+        # Followers that mapped an older file keep reading it after the unlink; only new loads need a live file.
+        stale = self._db.execute(
+            "SELECT gen, vectors_file FROM generations ORDER BY gen DESC LIMIT -1 OFFSET ?", (_KEEP_GENERATIONS,)
+        ).fetchall()
+        for gen, vectors_file in stale:
+            with contextlib.suppress(FileNotFoundError):
+                (self.directory / vectors_file).unlink()
+            self._db.execute("DELETE FROM generations WHERE gen = ?", (gen,))
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, TYPE_CHECKING
+
+import numpy as np
+from numpy import ndarray
+
+from core import get_logger
+
+if TYPE_CHECKING:
+    from core.registry.registry import Registry
+
+logger = get_logger(__name__)
+
+FORMAT_VERSION = 1
+_DATABASE = "registry.sqlite"
+
+
+@dataclass
+class RegistryState:
+    """Everything needed to rebuild a registry without re-registration or re-embedding."""
+
+    version: int
+    manifests: list[dict]
+    # Row i of ``vectors`` is the embedding of ``descriptions[i]``, indexed under ``keys[i]``.
+    keys: list[str] = field(default_factory=list)
+    descriptions: list[str] = field(default_factory=list)
+    vectors: ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.float32))
+    # Embedding model the vectors come from; vectors of another model (or of an unknown one) are not reused.
+    model: str | None = None
+
+
+class SnapshotStore:
+    """
+    Persist registry snapshots to a local directory.
+
+    Manifests and index metadata go to a SQLite database, the embedding matrix to a ``.npy`` file that is
+    memory-mapped on load, so restoring costs a few page faults rather than an embedding call per description.
+    Each save writes a new, uniquely named vector file before atomically replacing the database that points
+    at it, so a crash mid-save leaves the previous snapshot intact.
+    """
+
+    def __init__(self, directory: str | Path, interval: float = 60.0) -> None:
+        """Initialize the store.
+        Args:
+            directory (str | Path): Directory holding the snapshot; created if missing.
+            interval (float): Seconds between periodic snapshots taken by ``run``.
+        """
+        self.directory = Path(directory)
+        self.interval = interval
+        self.saved_version: tuple[int, int] | None = None
+
+    @classmethod
+    def from_env(cls) -> "SnapshotStore | None":
+        directory = os.getenv("REGISTRY_SNAPSHOT_DIR")
+        if not directory:
+            return None
+        return cls(directory, interval=float(os.getenv("REGISTRY_SNAPSHOT_INTERVAL_S", "60")))
+
+    def save(self, state: RegistryState) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        vectors_file = f"vectors-{uuid.uuid4().hex[:12]}.npy"
+        np.save(self.directory / vectors_file, np.ascontiguousarray(state.vectors, dtype=np.float32))
+
+        tmp = self.directory / f".{_DATABASE}.tmp"
+        tmp.unlink(missing_ok=True)
+        with sqlite3.connect(tmp) as db:
+            db.executescript(
+                """
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+                CREATE TABLE manifests (name TEXT PRIMARY KEY, hash TEXT, manifest TEXT NOT NULL);
+                CREATE TABLE vectors (row INTEGER PRIMARY KEY, key TEXT NOT NULL, description TEXT NOT NULL);
+                """
+            )
+            meta = [
+                ("format", str(FORMAT_VERSION)),
+                ("version", str(state.version)),
+                ("vectors_file", vectors_file),
+                ("dimension", str(state.vectors.shape[1] if state.vectors.ndim == 2 else 0)),
+                ("saved_at", str(time.time())),
+            ]
+            if state.model is not None:
+                meta.append(("model", state.model))
+            db.executemany("INSERT INTO meta VALUES (?, ?)", meta)
+            db.executemany(
+                "INSERT INTO manifests VALUES (?, ?, ?)",
+                [(m["name"], m.get("hash"), json.dumps(m)) for m in state.manifests],
+            )
+            db.executemany(
+                "INSERT INTO vectors VALUES (?, ?, ?)",
+                list(zip(range(len(state.keys)), state.keys, state.descriptions, strict=True)),
+            )
+        db.close()
+        os.replace(tmp, self.directory / _DATABASE)
+
+        for stale in self.directory.glob("vectors-*.npy"):
+            if stale.name != vectors_file:
+                stale.unlink(missing_ok=True)
+        logger.info(
+            "Saved registry snapshot",
+            extra={"directory": str(self.directory), "tools": len(state.manifests), "vectors": len(state.keys)},
+        )
+
+    def load(self) -> RegistryState | None:
+        """Read the last snapshot; None if there is none or it cannot be read, in which case the registry
+        starts empty and tools re-register."""
+        path = self.directory / _DATABASE
+        if not path.exists():
+            return None
+        try:
+            return self._load(path)
+        except (OSError, sqlite3.DatabaseError, KeyError, ValueError) as e:
+            logger.warning(
+                "Ignoring unreadable registry snapshot", extra={"directory": str(self.directory), "exception": e}
+            )
+            return None
+
+    def _load(self, path: Path) -> RegistryState | None:
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(db.execute("SELECT key, value FROM meta").fetchall())
+            if int(meta["format"]) != FORMAT_VERSION:
+                logger.warning("Ignoring registry snapshot in an unknown format", extra={"format": meta["format"]})
+                return None
+            manifests = [json.loads(row[0]) for row in db.execute("SELECT manifest FROM manifests ORDER BY rowid")]
+            rows = db.execute("SELECT key, description FROM vectors ORDER BY row").fetchall()
+        finally:
+            db.close()
+        vectors = np.load(self.directory / meta["vectors_file"], mmap_mode="r")
+        dimension = int(meta.get("dimension", vectors.shape[1] if vectors.ndim == 2 else 0))
+        if len(vectors) != len(rows) or (len(rows) and vectors.shape[1] != dimension):
+            logger.warning("Ignoring inconsistent registry snapshot", extra={"directory": str(self.directory)})
+            return None
+        return RegistryState(
+            version=int(meta["version"]),
+            manifests=manifests,
+            keys=[key for key, _ in rows],
+            descriptions=[description for _, description in rows],
+            vectors=vectors,
+            model=meta.get("model"),
+        )
+
+    async def save_registry(self, registry: "Registry", force: bool = False) -> None:
+        """Snapshot ``registry`` unless nothing changed since the last save.
+
+        Capturing the state only references the registry's current immutable snapshots; the writing happens in
+        a worker thread.
+        """
+        version = registry.index_version
+        if not force and version == self.saved_version:
+            return
+        state = registry.export_state()
+        await asyncio.to_thread(self.save, state)
+        self.saved_version = version
+
+    async def run(self, registry: "Registry", enabled: Callable[[], bool] = lambda: True) -> None:
+        """Save ``registry`` every ``interval`` seconds, while ``enabled()`` holds, until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            if not enabled():
+                continue
+            try:
+                await self.save_registry(registry)
+            except Exception:
+                logger.exception("Failed to save registry snapshot")
@@ -1,3 +1,4 @@
-from core.vec_db.dbase import VectorDB
+from core.vec_db.dbase import IndexSnapshot, VectorDB
+from core.vec_db.dispatcher import EmbeddingDispatcher
 
-__all__ = ["VectorDB"]
+__all__ = ["EmbeddingDispatcher", "IndexSnapshot", "VectorDB"]
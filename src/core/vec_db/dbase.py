@@ -1,30 +1,123 @@
-from typing import Callable
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
 
 import numpy as np
 from numpy import ndarray
 
 from core import get_logger
+from core.vec_db.dispatcher import EmbeddingDispatcher
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True, eq=False)
+class IndexSnapshot:
+    """One immutable version of the index; row i of ``vectors`` belongs to ``metadata[i]``."""
+
+    metadata: tuple[Any, ...]
+    vectors: ndarray
+    norms: ndarray
+    version: int
+
+    def __len__(self) -> int:
+        return len(self.metadata)
+
+
+_EMPTY = np.empty((0, 0), dtype=np.float32)
+_NO_NORMS = np.empty(0, dtype=np.float32)
+
+
 class VectorDB:
     """
     Simple in-memory vector database for storing and querying embeddings for the tools tags.
+
+    The index is published as an immutable ``IndexSnapshot``. Writers build the next snapshot aside, one per
+    batch, and swap it in with a single reference assignment, so queries never take a lock and always search
+    one consistent matrix, from any thread.
     """
 
-    def __init__(self, embedding_function: Callable) -> None:
+    def __init__(self, embedding_function: Callable, dispatcher: EmbeddingDispatcher | None = None) -> None:
         """Initialize the VectorDB with an embedding function.
         Args:
             embedding_function (Callable): A function that takes a string and returns its embedding as a numpy array.
+            dispatcher (EmbeddingDispatcher, optional): Batches concurrent async embedding requests.
+                Defaults to one configured from the ``EMBEDDING_*`` environment variables.
         """
         logger.debug("Initializing VectorDB")
         self.embedding_function = embedding_function
-        self.entries: list[dict] = []
+        self.dispatcher = dispatcher or EmbeddingDispatcher.from_env(self.embed_texts)
+        self.snapshot = IndexSnapshot((), _EMPTY, _NO_NORMS, 0)
+        # Serializes writers only; readers just load ``self.snapshot``.
+        self._write_lock = threading.Lock()
 
-    def add(self, description: str, metadata: dict) -> None:
-        embedding = self._embed_text(description)
-        self.entries.append({"vector": embedding, "metadata": metadata})
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    def add(self, description: str, metadata: Any) -> None:
+        """Embed ``description`` and store it with ``metadata``.
+        Args:
+            description (str): The text to embed.
+            metadata (Any): Returned by queries matching this entry.
+        """
+        embedding = self.embed_text(description)
+        with self._write_lock:
+            self._publish_locked(self.snapshot, None, [metadata], embedding[np.newaxis, :])
+
+    def export(self) -> tuple[list[Any], ndarray]:
+        """The metadata of every entry and their vectors as one matrix, in the same order."""
+        snapshot = self.snapshot
+        return list(snapshot.metadata), snapshot.vectors
+
+    def load(self, metadata: list[Any], vectors: ndarray) -> None:
+        """Add precomputed vectors (row i belongs to ``metadata[i]``), replacing entries with the same metadata.
+        Args:
+            metadata (list): One metadata value per row of ``vectors``.
+            vectors (np.ndarray): Normalized embeddings; a memory-mapped array is used without copying when the
+                index is empty.
+        """
+        if not metadata:
+            return
+        replaced = set(metadata)
+        with self._write_lock:
+            current = self.snapshot
+            keep = [i for i, meta in enumerate(current.metadata) if meta not in replaced]
+            self._publish_locked(current, keep, metadata, vectors)
+
+    def replace(self, metadata: list[Any], vectors: ndarray) -> None:
+        """Replace every entry with precomputed vectors; row i of ``vectors`` belongs to ``metadata[i]``."""
+        with self._write_lock:
+            self._publish_locked(self.snapshot, [], metadata, vectors)
+
+    def remove(self, metadata: set[Any]) -> None:
+        """Drop every entry whose metadata is in ``metadata``."""
+        with self._write_lock:
+            current = self.snapshot
+            keep = [i for i, meta in enumerate(current.metadata) if meta not in metadata]
+            if len(keep) != len(current):
+                self._publish_locked(current, keep, [], _EMPTY)
+
+    def _publish_locked(
+        self, current: IndexSnapshot, keep: list[int] | None, metadata: list[Any], vectors: ndarray
+    ) -> None:
+        """Swap in ``current`` restricted to the rows in ``keep`` (all when None) followed by the new rows."""
+        kept = current.vectors if keep is None or len(keep) == len(current) else current.vectors[keep]
+        kept_metadata = current.metadata if keep is None else tuple(current.metadata[i] for i in keep)
+        if not len(kept):
+            matrix = vectors
+        elif not len(vectors):
+            matrix = kept
+        else:
+            matrix = np.vstack([kept, vectors])
+        if len(kept_metadata) + len(metadata) != len(matrix):
+            raise ValueError("Every vector needs exactly one metadata value")
+        # Norms are computed once per version rather than once per query.
+        norms = np.linalg.norm(matrix, axis=1) if len(matrix) else _NO_NORMS
+        norms[norms == 0] = 1e-10  # Prevents division by zero
+        matrix = matrix.view()
+        matrix.flags.writeable = False
+        self.snapshot = IndexSnapshot((*kept_metadata, *metadata), matrix, norms, current.version + 1)
 
     def query(self, vector: ndarray, top_k: int = 5) -> list[dict]:
         """Query the vector database for the top_k closest embeddings to the given vector using cosine similarity.
@@ -34,14 +127,13 @@ class VectorDB:
         Returns:
             List of metadata of the top_k closest embeddings.
         """
-        if not self.entries:
+        snapshot = self.snapshot
+        if not snapshot.metadata:
             return []
-        embeddings_matrix = np.vstack([entry["vector"] for entry in self.entries])
-        norms = np.linalg.norm(embeddings_matrix, axis=1) * np.linalg.norm(vector)
-        norms[norms == 0] = 1e-10  # Prevents division by zero
-        similarities = embeddings_matrix @ vector / norms
+        query_norm = np.linalg.norm(vector) or 1e-10
+        similarities = snapshot.vectors @ vector / (snapshot.norms * query_norm)
         top_k_indices = np.argsort(similarities)[-top_k:][::-1]
-        return [self.entries[i]["metadata"] for i in top_k_indices]
+        return [snapshot.metadata[i] for i in top_k_indices]
 
     def text_query(self, text: str, top_k: int = 5) -> list[dict]:
         """Embed the given text and query the vector database.
@@ -51,10 +143,20 @@ class VectorDB:
         Returns:
             List of metadata of the top_k closest embeddings.
         """
-        query_vector = self._embed_text(text)
+        query_vector = self.embed_text(text)
         return self.query(query_vector, top_k=top_k)
 
-    def _embed_text(self, text: str) -> np.ndarray:
+    def embed_texts(self, texts: list[str]) -> list[ndarray]:
+        """Embed several texts with one call to the embedding function.
+        Args:
+            texts (list[str]): The texts to embed.
+        Returns:
+            list[np.ndarray]: One normalized embedding vector per text, in order.
+        """
+        response = self.embedding_function(contents=texts)
+        return [_normalize(np.array(embedding.values)) for embedding in response.embeddings]
+
+    def embed_text(self, text: str) -> np.ndarray:
         """Embed a given text using the embedding function.
         Args:
             text (str): The text to embed.
@@ -71,8 +173,11 @@ class VectorDB:
             embedding_values = response.embeddings[0].values
         elif hasattr(response, "embedding") and response.embedding:
             embedding_values = response.embedding.values
-        emb_vector = np.array(embedding_values)
-        norm = np.linalg.norm(emb_vector)
-        if norm > 0:
-            return emb_vector / norm
-        return emb_vector
+        return _normalize(np.array(embedding_values))
+
+
+def _normalize(vector: ndarray) -> ndarray:
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        return vector / norm
+    return vector
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import random
+import time
+from typing import Callable
+
+from numpy import ndarray
+
+from core import get_logger
+
+logger = get_logger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 503}
+
+
+class RateLimiter:
+    """Async token bucket: ``rate`` tokens per second, holding at most ``capacity`` tokens."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # Requests larger than the bucket would wait forever; they take a full bucket instead.
+        amount = min(amount, self.capacity)
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return
+            await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+class EmbeddingDispatcher:
+    """
+    Coalesce concurrent embedding requests into batched provider calls.
+
+    Callers ``await embed(text)``. Requests arriving within ``window`` seconds of each other (or while a
+    batch is in flight) are sent together, up to ``max_batch`` texts per call. Provider calls run one at a
+    time in a worker thread, are paced by a requests-per-second and a tokens-per-minute budget, and are
+    retried with exponential backoff on rate-limit and transient server errors. Each caller's future is
+    resolved with its own vector.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[list[str]], list[ndarray]],
+        window: float = 0.005,
+        max_batch: int = 100,
+        max_requests_per_second: float = 0.0,
+        max_tokens_per_minute: float = 0.0,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+    ) -> None:
+        """Initialize the dispatcher.
+        Args:
+            embed_batch (Callable): Blocking function embedding a list of texts into a list of vectors.
+            window (float): Seconds to wait for more requests before sending a partial batch.
+            max_batch (int): Maximum number of texts per provider call.
+            max_requests_per_second (float): Provider calls per second; 0 disables the limit.
+            max_tokens_per_minute (float): Estimated input tokens per minute; 0 disables the limit.
+            max_retries (int): Retries of a batch on retryable errors before failing its callers.
+            backoff (float): Initial backoff in seconds, doubled (with jitter) on each retry.
+        """
+        self.embed_batch = embed_batch
+        self.window = window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._request_limiter = (
+            RateLimiter(max_requests_per_second, max(max_requests_per_second, 1.0))
+            if max_requests_per_second > 0
+            else None
+        )
+        self._token_limiter = (
+            RateLimiter(max_tokens_per_minute / 60.0, max_tokens_per_minute) if max_tokens_per_minute > 0 else None
+        )
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flusher: asyncio.Task | None = None
+        self.batches = 0
+
+    @classmethod
+    def from_env(cls, embed_batch: Callable[[list[str]], list[ndarray]]) -> "EmbeddingDispatcher":
+        return cls(
+            embed_batch,
+            window=float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5")) / 1000.0,
+            max_batch=int(os.getenv("EMBEDDING_MAX_BATCH", "100")),
+            max_requests_per_second=float(os.getenv("EMBEDDING_MAX_RPS", "0")),
+            max_tokens_per_minute=float(os.getenv("EMBEDDING_MAX_TOKENS_PER_MINUTE", "0")),
+            max_retries=int(os.getenv("EMBEDDING_MAX_RETRIES", "5")),
+        )
+
+    async def embed(self, text: str) -> ndarray:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        while self._pending:
+            if len(self._pending) < self.max_batch:
+                await asyncio.sleep(self.window)
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if batch:
+                await self._dispatch(batch)
+
+    async def _dispatch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            vectors = await self._call_provider(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"Embedding provider returned {len(vectors)} vectors for {len(texts)} texts")
+        except Exception as e:
+            logger.warning("Embedding batch failed", extra={"batch_size": len(texts), "exception": e})
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), vector in zip(batch, vectors, strict=True):
+            if not future.done():
+                future.set_result(vector)
+
+    async def _call_provider(self, texts: list[str]) -> list[ndarray]:
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            if self._request_limiter is not None:
+                await self._request_limiter.acquire()
+            if self._token_limiter is not None:
+                await self._token_limiter.acquire(sum(len(text) // 4 + 1 for text in texts))
+            try:
+                self.batches += 1
+                return await asyncio.to_thread(self.embed_batch, texts)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                logger.warning(
+                    "Embedding call rate limited or failed; backing off",
+                    extra={"attempt": attempt + 1, "delay": delay, "exception": e},
+                )
+                await asyncio.sleep(delay * (1.0 + random.random()))  # noqa: S311
+                delay *= 2
+        raise AssertionError("unreachable")
+
+
+def _is_retryable(error: Exception) -> bool:
+    status = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return status in RETRYABLE_STATUS or "RESOURCE_EXHAUSTED" in str(error)
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
 
+from core.encoding import FastJSONResponse
+
 from .service import list_available_tools, random_value
 
 router = APIRouter()
@@ -7,10 +9,11 @@ router = APIRouter()
 
 @router.get(
     "/tools",
+    response_model=dict[str, list[str]],
 )
-async def list_tools() -> dict[str, list[str]]:
+async def list_tools() -> FastJSONResponse:
     tools = list_available_tools()
-    return {"tools": tools}
+    return FastJSONResponse({"tools": tools})
 
 
 @router.get(
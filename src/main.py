@@ -1,17 +1,87 @@
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from fastapi import FastAPI, Response
 
 from core import get_logger, registry_router
+from core.blobs import blobs_router, BlobStore
 from core.communication import communication_router
+from core.encoding import CompressionMiddleware, FastJSONResponse
+from core.profiling import profiling_router_from_env
+from core.registry.registry import load_tool_functions
 from core.registry.registry import registry as tool_registry
+from core.registry.shared import SharedRegistry
+from core.registry.snapshot import SnapshotStore
 from core_tools import tool_manager
 
 logger = get_logger(__name__)
 
 
-app = FastAPI()
+async def _cancel(task: asyncio.Task | None) -> None:
+    if task is not None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Co-located SDK tools, e.g. LOCAL_TOOL_MODULES="service,my_pkg.tools:TOOLS", are called without HTTP.
+    for spec in filter(None, os.getenv("LOCAL_TOOL_MODULES", "").split(",")):
+        tool_registry.register_local(load_tool_functions(spec))
+    # Tools and embeddings from the last run are back before the first request, without waiting on re-registration.
+    snapshots = SnapshotStore.from_env()
+    state = snapshots.load() if snapshots is not None else None
+    if state is not None:
+        tool_registry.restore_state(state)
+    # With several workers, registrations are shared through SHARED_STATE_DIR and only the leader embeds.
+    shared = SharedRegistry.from_env(tool_registry)
+    app.state.shared_registry = shared
+    if shared is not None:
+        shared.start()
+    else:
+        # Descriptions registered at import time are embedded in the background so startup never waits on the API.
+        tool_registry.start_indexing()
+    syncer = asyncio.create_task(shared.run()) if shared is not None else None
+
+    def is_leader() -> bool:
+        return shared is None or shared.leader
+
+    saver = asyncio.create_task(snapshots.run(tool_registry, is_leader)) if snapshots is not None else None
+    # Large tool values passed by handle between calls; see BLOB_STORE_DIR.
+    blob_store = BlobStore.from_env()
+    app.state.blob_store = blob_store
+    evicter = asyncio.create_task(blob_store.run()) if blob_store is not None else None
+    yield
+    await _cancel(evicter)
+    await _cancel(saver)
+    await _cancel(syncer)
+    await tool_registry.stop_indexing()
+    if snapshots is not None and is_leader():
+        try:
+            await snapshots.save_registry(tool_registry)
+        except Exception:
+            logger.exception("Failed to save registry snapshot on shutdown")
+    if shared is not None:
+        shared.close()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    max_request_size=int(os.getenv("MAX_REQUEST_BODY_BYTES", str(32 * 1024 * 1024))),
+)
 app.include_router(tool_manager.router)
 app.include_router(registry_router.router)
 app.include_router(communication_router)
+app.include_router(blobs_router)
+# Opt-in: /debug/profile and /debug/memory only exist when PROFILING_TOKEN is set.
+if (profiling := profiling_router_from_env()) is not None:
+    app.include_router(profiling)
 
 
 @app.get("/", include_in_schema=False)
@@ -25,12 +95,21 @@ async def health() -> dict[str, str]:
 
 
 @app.get("/ready", include_in_schema=False)
-async def ready() -> dict[str, str | int]:
+async def ready(response: Response) -> dict[str, Any]:
     try:
         tools = tool_registry.list_tools()
+        indexing: dict[str, Any] = dict(tool_registry.indexing_status())
+        shared = getattr(app.state, "shared_registry", None)
+        if shared is not None:
+            indexing["shared"] = shared.status()
+        if not (shared.index_ready if shared is not None else tool_registry.index_ready):
+            response.status_code = 503
+            return {"status": "indexing", "tools_registered": len(tools), "indexing": indexing}
         return {
             "status": "ready",
             "tools_registered": len(tools),
+            "indexing": indexing,
         }
     except Exception as e:
+        response.status_code = 503
         return {"status": "not-ready", "error": str(e)}
@@ -0,0 +1,48 @@
+import sys
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from benchmarks.server import fake_embed
+from core.registry.registry import Registry
+
+
+class CountingEmbedder:
+    """The benchmarks' offline embedding function, recording every text it embeds."""
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def __call__(self, *, contents: str | list[str], **kwargs: Any) -> SimpleNamespace:
+        self.texts.extend(contents if isinstance(contents, list) else [contents])
+        return fake_embed(contents=contents, **kwargs)
+
+
+@pytest.fixture()
+def embedder() -> CountingEmbedder:
+    return CountingEmbedder()
+
+
+@pytest.fixture()
+def make_registry() -> Callable[[], tuple[Registry, CountingEmbedder]]:
+    """Factory for registries that embed offline, each through its own ``CountingEmbedder``."""
+
+    def make() -> tuple[Registry, CountingEmbedder]:
+        registry = Registry("test")
+        embedder = CountingEmbedder()
+        registry._vec_db.embedding_function = embedder
+        return registry, embedder
+
+    return make
+
+
+@pytest.fixture()
+def tool_sdk(monkeypatch: pytest.MonkeyPatch) -> Any:
+    """The real tool_sdk package; test_calculator replaces it with a stub module."""
+    for name in [m for m in sys.modules if m == "tool_sdk" or m.startswith("tool_sdk.")]:
+        monkeypatch.delitem(sys.modules, name)
+    import tool_sdk
+
+    return tool_sdk
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.admission import AdmissionController, AdmissionRejected, Priority
+from core.registry import registry_router
+
+
+async def hold(
+    controller: AdmissionController,
+    tool: str,
+    gate: asyncio.Event,
+    order: list[str],
+    label: str,
+    priority: Priority = Priority.INTERACTIVE,
+) -> None:
+    async with controller.slot(tool, priority):
+        order.append(label)
+        await gate.wait()
+
+
+async def test_interactive_calls_overtake_batch_calls() -> None:
+    controller = AdmissionController(max_concurrency=1, interactive_reserve=0)
+    gate = asyncio.Event()
+    order: list[str] = []
+
+    first = asyncio.create_task(hold(controller, "t", gate, order, "first"))
+    await asyncio.sleep(0)
+    batch = asyncio.create_task(hold(controller, "t", gate, order, "batch", Priority.BATCH))
+    interactive = asyncio.create_task(hold(controller, "t", gate, order, "interactive"))
+    await asyncio.sleep(0)
+    assert controller.stats() == {"running": 1, "queued": 2}
+
+    gate.set()
+    await asyncio.gather(first, batch, interactive)
+    assert order == ["first", "interactive", "batch"]
+    assert controller.stats() == {"running": 0, "queued": 0}
+
+
+async def test_full_queue_and_deadline_are_rejected() -> None:
+    controller = AdmissionController(max_concurrency=2, max_concurrency_per_tool=1, max_queue_per_tool=1)
+    gate = asyncio.Event()
+    running = asyncio.create_task(hold(controller, "t", gate, [], "running"))
+    await asyncio.sleep(0)
+
+    queued = asyncio.create_task(hold(controller, "t", gate, [], "queued"))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller._acquire("t", Priority.INTERACTIVE, queue_timeout=1.0)
+    assert rejected.value.retry_after >= 1
+
+    # Another tool still has a free slot even though "t" is saturated.
+    async with controller.slot("other"):
+        pass
+
+    gate.set()
+    await asyncio.gather(running, queued)
+
+    gate.clear()
+    running = asyncio.create_task(hold(controller, "t", gate, [], "running"))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected):
+        async with controller.slot("t", queue_timeout=0.01):
+            pass
+    gate.set()
+    await running
+    assert controller.stats() == {"running": 0, "queued": 0}
+
+
+async def test_batch_calls_leave_reserve_for_interactive() -> None:
+    controller = AdmissionController(max_concurrency=2, interactive_reserve=1)
+    gate = asyncio.Event()
+    batch = asyncio.create_task(hold(controller, "a", gate, [], "batch", Priority.BATCH))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected):
+        async with controller.slot("b", Priority.BATCH, queue_timeout=0.01):
+            pass
+    async with controller.slot("b"):
+        pass
+
+    gate.set()
+    await batch
+
+
+async def test_client_queue_timeout_cannot_exceed_the_configured_deadline() -> None:
+    controller = AdmissionController(max_concurrency=1, queue_timeouts={Priority.INTERACTIVE: 0.01})
+    gate = asyncio.Event()
+    running = asyncio.create_task(hold(controller, "t", gate, [], "running"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected, match="0.010s"):
+        async with asyncio.timeout(1), controller.slot("t", queue_timeout=3600):
+            pass
+    gate.set()
+    await running
+
+
+def test_queue_timeout_must_be_positive() -> None:
+    app = FastAPI()
+    app.include_router(registry_router.router)
+    client = TestClient(app)
+    for timeout in (0, -5):
+        response = client.post("/tools/call", json={"tool_name": "t", "queue_timeout_ms": timeout})
+        assert response.status_code == 422
@@ -0,0 +1,235 @@
+import io
+import os
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import orjson
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.blobs import BlobNotFound, blobs_router, BlobStore, HANDLE_KEY
+from core.registry import registry_router
+from core.registry.registry import Registry
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> BlobStore:
+    return BlobStore(tmp_path / "blobs", inline_limit=256)
+
+
+def test_blobs_are_content_addressed_and_memory_mapped(store: BlobStore) -> None:
+    array = np.arange(1000, dtype=np.float32)
+    handle = store.put_value(array)
+    assert store.put_value(array.copy()) == handle
+    assert len(list(store.directory.iterdir())) == 1
+
+    loaded = store.load(handle[HANDLE_KEY])
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, array)
+
+    document = {"rows": [{"id": i} for i in range(3)]}
+    nested = {"frame": store.put_value(document), "items": [handle, 1]}
+    resolved = store.resolve(nested)
+    assert resolved["frame"] == document
+    np.testing.assert_array_equal(resolved["items"][0], array)
+
+    with pytest.raises(BlobNotFound):
+        store.load("../" + handle[HANDLE_KEY])
+
+
+def test_offload_keeps_small_values_inline(store: BlobStore) -> None:
+    assert store.offload(42) == 42
+    small = store.offload({"a": 1})
+    assert orjson.loads(orjson.dumps({"result": small})) == {"result": {"a": 1}}
+    large = store.offload(list(range(1000)))
+    assert large == {HANDLE_KEY: large[HANDLE_KEY], "size": large["size"]}
+    assert store.load(large[HANDLE_KEY]) == list(range(1000))
+
+
+def test_eviction_drops_expired_then_least_recently_used(store: BlobStore) -> None:
+    handles = [store.put_value(list(range(i * 100, i * 100 + 100))) for i in range(4)]
+    paths = [store.directory / handle[HANDLE_KEY] for handle in handles]
+    now = time.time()
+    for age, path in zip((10_000, 30, 20, 10), paths, strict=True):
+        os.utime(path, (now - age, now - age))
+    store.ttl = 3600
+    store.max_bytes = sum(path.stat().st_size for path in paths[2:])
+
+    assert store.evict() == 2
+    assert [path.exists() for path in paths] == [False, False, True, True]
+
+
+def test_fetching_a_blob_over_http_counts_as_a_use(store: BlobStore) -> None:
+    app = FastAPI()
+    app.state.blob_store = store
+    app.include_router(blobs_router)
+    handles = [store.put_value(list(range(i * 100, i * 100 + 100))) for i in range(2)]
+    paths = [store.directory / handle[HANDLE_KEY] for handle in handles]
+    old = time.time() - 10_000
+    for path in paths:
+        os.utime(path, (old, old))
+    store.ttl = 3600
+
+    assert TestClient(app).get(f"/blobs/{handles[0][HANDLE_KEY]}").status_code == 200
+    assert store.evict() == 1
+    assert [path.exists() for path in paths] == [True, False]
+
+
+def test_tool_calls_resolve_handles_and_return_large_results_by_handle(
+    store: BlobStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    registry = Registry("test")
+    monkeypatch.setattr(registry_router, "tool_registry", registry)
+    seen: list[Any] = []
+
+    def make(n: int) -> Any:
+        return np.ones(n)
+
+    def total(values: Any) -> float:
+        seen.append(values)
+        return float(np.sum(values))
+
+    registry.register_tool(
+        {
+            "name": "arrays",
+            "base_url": "inprocess://local",
+            "methods": [{"name": "make", "description": "Make"}, {"name": "total", "description": "Sum"}],
+        },
+        callables={"make": make, "total": total},
+    )
+    app = FastAPI()
+    app.state.blob_store = store
+    app.include_router(registry_router.router)
+    app.include_router(blobs_router)
+    client = TestClient(app)
+
+    handle = client.post("/tools/call", json={"tool_name": "arrays.make", "args": [4096]}).json()["result"]
+    assert handle[HANDLE_KEY].endswith(".npy")
+    assert client.post("/tools/call", json={"tool_name": "arrays.make", "args": [2]}).json() == {"result": [1.0, 1.0]}
+
+    result = client.post("/tools/call", json={"tool_name": "arrays.total", "kwargs": {"values": handle}})
+    assert result.json() == {"result": 4096.0}
+    assert isinstance(seen[0], np.memmap)
+
+    fetched = client.get(f"/blobs/{handle[HANDLE_KEY]}")
+    assert fetched.headers["content-type"] == "application/x-npy"
+    uploaded = client.post("/blobs", content=fetched.content, headers={"Content-Type": "application/x-npy"})
+    assert uploaded.status_code == 201
+    assert uploaded.json() == handle
+    assert client.get("/blobs/" + "0" * 64 + ".npy").status_code == 404
+    missing = {HANDLE_KEY: "f" * 64 + ".json", "size": 1}
+    assert client.post("/tools/call", json={"tool_name": "arrays.total", "args": [missing]}).status_code == 404
+
+
+def test_sdk_apps_pass_large_values_by_handle(store: BlobStore, tool_sdk: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TOOL_PUBLIC_URL", "http://arrays:8000")
+    monkeypatch.setenv("BLOB_STORE_DIR", str(store.directory))
+    monkeypatch.setenv("BLOB_INLINE_LIMIT_BYTES", "256")
+    seen: list[Any] = []
+
+    @tool_sdk.mcp_tool(name="arrays")
+    def make(n: int) -> Any:
+        """Make an array of ones."""
+        return np.ones(n)
+
+    @tool_sdk.mcp_tool(name="arrays")
+    def total(values: Any) -> float:
+        """Sum an array."""
+        seen.append(values)
+        return float(np.sum(values))
+
+    client = TestClient(tool_sdk.create_app([make, total]))
+    handle = client.post("/invoke/make", json={"method": "make", "args": [4096]}).json()["result"]
+    # Written straight into the server's store, which can serve it to tools on other hosts.
+    np.testing.assert_array_equal(store.load(handle[HANDLE_KEY]), np.ones(4096))
+
+    result = client.post("/invoke/total", json={"method": "total", "args": [handle]})
+    assert result.json() == {"result": 4096.0}
+    assert isinstance(seen[0], np.memmap)
+    assert client.post("/invoke/make", json={"method": "make", "args": [2]}).json() == {"result": [1.0, 1.0]}
+
+
+@pytest.fixture()
+def blob_server(store: BlobStore) -> Iterator[str]:
+    """A server exposing ``store`` over /blobs on a loopback port, for tools on other hosts."""
+    app = FastAPI()
+    app.state.blob_store = store
+    app.include_router(blobs_router)
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]})
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    server.should_exit = True
+    thread.join()
+    sock.close()
+
+
+def test_sdk_apps_fetch_blobs_over_http_and_report_missing_ones(
+    store: BlobStore, blob_server: str, tool_sdk: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("TOOL_PUBLIC_URL", "http://arrays:8000")
+    monkeypatch.setenv("MCP_SERVER_URL", blob_server)
+    monkeypatch.delenv("BLOB_STORE_DIR", raising=False)
+
+    @tool_sdk.mcp_tool(name="arrays")
+    def total(values: Any) -> float:
+        """Sum an array."""
+        return float(np.sum(values))
+
+    client = TestClient(tool_sdk.create_app([total]))
+    handle = store.put_value(np.arange(10.0))
+    assert client.post("/invoke/total", json={"method": "total", "args": [handle]}).json() == {"result": 45.0}
+
+    missing = {HANDLE_KEY: "f" * 64 + ".npy", "size": 1}
+    response = client.post("/invoke/total", json={"method": "total", "args": [missing]})
+    assert response.status_code == 404
+    malformed = {HANDLE_KEY: "../secret.npy", "size": 1}
+    assert client.post("/invoke/total", json={"method": "total", "args": [malformed]}).status_code == 404
+
+
+def test_uploads_must_be_valid_blobs(store: BlobStore) -> None:
+    app = FastAPI()
+    app.state.blob_store = store
+    app.include_router(blobs_router)
+    client = TestClient(app)
+    npy = {"Content-Type": "application/x-npy"}
+
+    valid = io.BytesIO()
+    np.save(valid, np.arange(10, dtype=np.int32))
+    assert client.post("/blobs", content=valid.getvalue(), headers=npy).status_code == 201
+
+    pickled = io.BytesIO()
+    np.save(pickled, np.array([{"a": 1}], dtype=object), allow_pickle=True)
+    for body in (b"", b"not an array", valid.getvalue()[:-4], valid.getvalue() + b"\0", pickled.getvalue()):
+        assert client.post("/blobs", content=body, headers=npy).status_code == 400
+    for body in (b"", b"{not json"):
+        assert client.post("/blobs", content=body, headers={"Content-Type": "application/json"}).status_code == 400
+    assert [path.suffix for path in store.directory.iterdir()] == [".npy"]
+
+
+def test_uploads_are_limited_in_size(store: BlobStore) -> None:
+    store.max_upload_bytes = 1000
+    app = FastAPI()
+    app.state.blob_store = store
+    app.include_router(blobs_router)
+    client = TestClient(app)
+    body = orjson.dumps(list(range(2000)))
+    json_type = {"Content-Type": "application/json"}
+
+    assert client.post("/blobs", content=body, headers=json_type).status_code == 413
+    # Streamed without a Content-Length.
+    chunks = iter([body[i : i + 512] for i in range(0, len(body), 512)])
+    assert client.post("/blobs", content=chunks, headers=json_type).status_code == 413
+    assert list(store.directory.iterdir()) == []
+    assert client.post("/blobs", content=orjson.dumps(list(range(100))), headers=json_type).status_code == 201
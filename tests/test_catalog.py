@@ -0,0 +1,85 @@
+from typing import Any
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.registry import registry_router
+from core.registry.registry import Registry
+
+
+def manifest(*methods: str, description: str = "") -> dict[str, Any]:
+    return {
+        "name": "calc",
+        "base_url": "http://calc:5080",
+        "description": description,
+        "methods": [{"name": m, "description": f"{m} two numbers"} for m in methods],
+    }
+
+
+@pytest.fixture()
+def registry(monkeypatch: pytest.MonkeyPatch) -> Registry:
+    registry = Registry("test")
+    monkeypatch.setattr(registry_router, "tool_registry", registry)
+    return registry
+
+
+@pytest.fixture()
+def client(registry: Registry) -> TestClient:
+    app = FastAPI()
+    app.include_router(registry_router.router)
+    return TestClient(app)
+
+
+def test_catalog_tracks_added_updated_and_removed_tools(registry: Registry) -> None:
+    registry.register_tool(manifest("add", "sub"))
+    first = registry.catalog.version
+    assert orjson.loads(registry.catalog.render()) == registry.get_tool_definitions()
+
+    registry.register_tool(manifest("add", "sub"))
+    assert registry.catalog.version == first
+
+    registry.register_tool(manifest("add", "mul", description="Arithmetic"))
+    changes = registry.catalog.changes(first)
+    assert set(changes["added"]) == {"calc.mul"}
+    assert set(changes["updated"]) == {"calc"}
+    assert changes["removed"] == ["calc.sub"]
+    assert "calc.sub" not in registry.list_tools()
+
+    assert registry.catalog.changes(registry.catalog.version) == {
+        "version": registry.catalog.version,
+        "epoch": registry.catalog.epoch,
+        "reset": False,
+        "added": {},
+        "updated": {},
+        "removed": [],
+    }
+    stale = registry.catalog.changes(registry.catalog.version + 10)
+    assert stale["reset"] is True
+    assert set(stale["added"]) == {"calc", "calc.add", "calc.mul"}
+    assert registry.catalog.changes(first, epoch="another-worker")["reset"] is True
+
+
+def test_definitions_endpoint_serves_etag_pages_and_projection(registry: Registry, client: TestClient) -> None:
+    registry.register_tool(manifest("add", "sub", "mul"))
+
+    full = client.get("/tools/definitions")
+    assert full.json() == registry.get_tool_definitions()
+    etag = full.headers["etag"]
+    assert client.get("/tools/definitions", headers={"If-None-Match": etag}).status_code == 304
+
+    page = client.get("/tools/definitions", params={"offset": 1, "limit": 2, "fields": "name,description"})
+    assert page.json() == {
+        "calc.add": {"name": "calc.add", "description": "add two numbers"},
+        "calc.sub": {"name": "calc.sub", "description": "sub two numbers"},
+    }
+    assert page.headers["x-total-count"] == "4"
+    assert page.headers["x-next-offset"] == "3"
+
+    version = int(full.headers["x-catalog-version"])
+    registry.register_tool(manifest("add", "sub"))
+    assert client.get("/tools/definitions", headers={"If-None-Match": etag}).status_code == 200
+    feed = client.get("/tools/definitions", params={"since": version}).json()
+    assert feed["removed"] == ["calc.mul"]
+    assert feed["version"] == version + 1
@@ -0,0 +1,98 @@
+import asyncio
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+import numpy as np
+import orjson
+import pytest
+
+from benchmarks.server import EMBEDDING_DIM
+from core.registry.registry import Registry
+
+TOOLS = [f"t{i}" for i in range(4)]
+GENERATIONS = 40
+
+
+def manifest(tool: str, generation: int) -> dict[str, Any]:
+    # Every generation changes the method set, so re-registration adds, rewords and removes methods.
+    return {
+        "name": tool,
+        "base_url": f"http://{tool}:5080",
+        "version": str(generation),
+        "methods": [{"name": f"m{j}", "description": f"{tool} m{j} v{generation}"} for j in range(generation % 3 + 1)],
+    }
+
+
+def check_consistent(definitions: dict[str, dict[str, Any]]) -> None:
+    """Every tool and its methods come from the same registration."""
+    for tool in TOOLS:
+        if tool not in definitions:
+            continue
+        version = definitions[tool]["version"]
+        methods = {name for name in definitions if name.startswith(f"{tool}.")}
+        assert methods == {f"{tool}.m{j}" for j in range(int(version) % 3 + 1)}
+        assert all(definitions[name]["version"] == version for name in methods)
+
+
+def register(registry: Registry, worker: int) -> None:
+    for generation in range(GENERATIONS):
+        for tool in TOOLS[worker:] + TOOLS[:worker]:
+            registry.register_tool(manifest(tool, generation))
+
+
+def read(registry: Registry, done: threading.Event) -> int:
+    reads = 0
+    query = np.ones(EMBEDDING_DIM)
+    while not done.is_set() or reads == 0:
+        check_consistent(registry.tool_registry)
+        catalog = registry.catalog.current
+        check_consistent(catalog.definitions)
+        assert orjson.loads(catalog.render()) == catalog.definitions
+        assert set(catalog.names) == set(catalog.definitions)
+
+        index = registry._vec_db.snapshot
+        assert len(index.metadata) == len(index.vectors) == len(index.norms)
+        # The query may already search a newer version than ``index``.
+        hits = registry.query_tools_by_vector(query, top_k=3)
+        assert len(hits) == len(set(hits)) <= 3
+        if "t0" in registry.list_tools():
+            assert registry.call_tool("t0")["tool"] == "t0"
+        reads += 1
+    return reads
+
+
+@pytest.fixture()
+def frequent_thread_switches() -> Iterator[None]:
+    # Switch threads as often as possible so readers land in the middle of registrations.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.usefixtures("frequent_thread_switches")
+async def test_readers_never_see_half_registered_tools(embedder: Callable[..., SimpleNamespace]) -> None:
+    registry = Registry("test")
+    registry._vec_db.embedding_function = embedder
+    registry.start_indexing()
+    loop = asyncio.get_running_loop()
+    done = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        readers = [loop.run_in_executor(pool, read, registry, done) for _ in range(4)]
+        # The event loop stays free while the writers run, so the indexer publishes concurrently.
+        await asyncio.gather(*(loop.run_in_executor(pool, register, registry, worker) for worker in range(4)))
+        done.set()
+        assert all(reads > 0 for reads in await asyncio.gather(*readers))
+
+    await registry.wait_until_indexed()
+    await registry.stop_indexing()
+    described = {name: entry["description"] for name, entry in registry.tool_registry.items() if entry["description"]}
+    index = registry._vec_db.snapshot
+    assert sorted(index.metadata) == sorted(described)
+    assert registry._embedded == described
+    assert registry.indexing_status()["pending"] == 0
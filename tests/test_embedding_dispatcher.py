@@ -0,0 +1,57 @@
+import asyncio
+
+import numpy as np
+import pytest
+from numpy import ndarray
+
+from core.vec_db.dispatcher import EmbeddingDispatcher
+
+
+class RateLimitedError(Exception):
+    code = 429
+
+
+class FakeProvider:
+    def __init__(self, failures: int = 0) -> None:
+        self.calls: list[list[str]] = []
+        self.failures = failures
+
+    def __call__(self, texts: list[str]) -> list[ndarray]:
+        self.calls.append(list(texts))
+        if self.failures:
+            self.failures -= 1
+            raise RateLimitedError("RESOURCE_EXHAUSTED")
+        return [np.array([float(len(text)), 1.0]) for text in texts]
+
+
+async def test_concurrent_requests_are_coalesced() -> None:
+    provider = FakeProvider()
+    dispatcher = EmbeddingDispatcher(provider, window=0.01, max_batch=4)
+
+    texts = [f"text {'x' * i}" for i in range(10)]
+    vectors = await asyncio.gather(*(dispatcher.embed(text) for text in texts))
+
+    assert [len(call) for call in provider.calls] == [4, 4, 2]
+    for text, vector in zip(texts, vectors, strict=True):
+        assert vector[0] == len(text)
+
+
+async def test_rate_limited_batches_are_retried() -> None:
+    provider = FakeProvider(failures=2)
+    dispatcher = EmbeddingDispatcher(provider, window=0.0, backoff=0.001)
+
+    vectors = await asyncio.gather(dispatcher.embed("a"), dispatcher.embed("bb"))
+
+    assert len(provider.calls) == 3
+    assert [v[0] for v in vectors] == [1.0, 2.0]
+
+
+async def test_errors_propagate_to_every_caller() -> None:
+    provider = FakeProvider(failures=10)
+    dispatcher = EmbeddingDispatcher(provider, window=0.0, max_retries=1, backoff=0.001)
+
+    results = await asyncio.gather(dispatcher.embed("a"), dispatcher.embed("b"), return_exceptions=True)
+
+    assert all(isinstance(r, RateLimitedError) for r in results)
+    with pytest.raises(RateLimitedError):
+        await dispatcher.embed("c")
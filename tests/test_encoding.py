@@ -0,0 +1,128 @@
+import gzip
+import threading
+from typing import Any
+
+import numpy as np
+import orjson
+import pytest
+import zstandard
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from core.encoding import CompressionMiddleware, FastJSONResponse, negotiate_encoding
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=100, max_request_size=10_000)
+
+    @app.get("/items")
+    async def items(count: int) -> FastJSONResponse:
+        return FastJSONResponse({"items": [{"id": i, "name": f"item-{i}"} for i in range(count)]})
+
+    @app.get("/vector")
+    async def vector() -> FastJSONResponse:
+        return FastJSONResponse({"vector": np.arange(3, dtype=np.float32), 1: "non-str key"})
+
+    @app.post("/echo")
+    async def echo(request: Request) -> dict[str, Any]:
+        return {"received": await request.json()}
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("gzip, zstd", "zstd"),
+        ("zstd;q=0.5, gzip;q=0.8", "gzip"),
+        ("*", "zstd"),
+        ("zstd;q=0, *;q=0.1", "gzip"),
+        ("br, identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(header: str, expected: str | None) -> None:
+    assert negotiate_encoding(header) == expected
+
+
+def test_large_responses_are_compressed_as_negotiated(client: TestClient) -> None:
+    zstd = client.get("/items", params={"count": 200}, headers={"Accept-Encoding": "zstd"})
+    assert zstd.headers["content-encoding"] == "zstd"
+    assert zstd.headers["vary"] == "Accept-Encoding"
+    assert int(zstd.headers["content-length"]) < len(orjson.dumps(zstd.json()))
+
+    gz = client.get("/items", params={"count": 200}, headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.json()["items"][199] == {"id": 199, "name": "item-199"}
+
+    small = client.get("/items", params={"count": 1}, headers={"Accept-Encoding": "gzip, zstd"})
+    assert "content-encoding" not in small.headers
+
+    identity = client.get("/items", params={"count": 200}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+
+def test_fast_json_response_handles_numpy_and_non_str_keys(client: TestClient) -> None:
+    assert client.get("/vector").json() == {"vector": [0.0, 1.0, 2.0], "1": "non-str key"}
+
+
+def test_compressed_request_bodies_are_decoded(client: TestClient) -> None:
+    body = orjson.dumps({"manifest": "x" * 500})
+    for encoding, data in (("gzip", gzip.compress(body)), ("zstd", zstandard.ZstdCompressor().compress(body))):
+        response = client.post(
+            "/echo",
+            content=data,
+            headers={"Content-Encoding": encoding, "Content-Type": "application/json"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"received": {"manifest": "x" * 500}}
+
+    bomb = gzip.compress(b"0" * 20_000)
+    assert client.post("/echo", content=bomb, headers={"Content-Encoding": "gzip"}).status_code == 413
+    assert client.post("/echo", content=b"not gzip", headers={"Content-Encoding": "gzip"}).status_code == 400
+    # A valid gzip header followed by a corrupt deflate stream.
+    corrupt = gzip.compress(body)[:10] + b"\xff" * 8 + gzip.compress(body)[18:]
+    assert client.post("/echo", content=corrupt, headers={"Content-Encoding": "gzip"}).status_code == 400
+    assert client.post("/echo", content=body, headers={"Content-Encoding": "br"}).status_code == 415
+
+
+def test_multi_frame_zstd_bodies_are_decoded_whole(client: TestClient) -> None:
+    body = orjson.dumps({"manifest": "x" * 500})
+    compressor = zstandard.ZstdCompressor()
+    # One frame per flush, as streaming clients send them.
+    frames = b"".join(compressor.compress(body[i : i + 100]) for i in range(0, len(body), 100))
+    response = client.post("/echo", content=frames, headers={"Content-Encoding": "zstd"})
+    assert response.status_code == 200
+    assert response.json() == {"received": {"manifest": "x" * 500}}
+
+    bomb = b"".join(compressor.compress(b"0" * 4_000) for _ in range(3))
+    assert client.post("/echo", content=bomb, headers={"Content-Encoding": "zstd"}).status_code == 413
+
+
+def test_large_responses_are_compressed_off_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    threads: dict[str, int] = {}
+    compress = CompressionMiddleware._zstd_compress
+
+    def recording_compress(self: CompressionMiddleware, body: bytes) -> bytes:
+        threads[f"compress-{len(body) >= self.thread_min_size}"] = threading.get_ident()
+        return compress(self, body)
+
+    monkeypatch.setattr(CompressionMiddleware, "_zstd_compress", recording_compress)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, thread_min_size=10_000)
+
+    @app.get("/blob")
+    async def blob(size: int) -> Response:
+        threads["loop"] = threading.get_ident()
+        return Response(b"x" * size)
+
+    client = TestClient(app)
+    for size in (1_000, 100_000):
+        response = client.get("/blob", params={"size": size}, headers={"Accept-Encoding": "zstd"})
+        assert response.headers["content-encoding"] == "zstd"
+        assert response.content == b"x" * size
+    assert threads["compress-False"] == threads["loop"]
+    assert threads["compress-True"] != threads["loop"]
@@ -0,0 +1,51 @@
+from typing import Any
+
+import pytest
+
+from core.registry.registry import Registry
+
+
+def test_register_tool_binds_callables_in_process() -> None:
+    registry = Registry("test")
+    payload = {"big": list(range(3))}
+    registry.register_tool(
+        {"name": "local", "base_url": "inprocess://local", "methods": [{"name": "get", "description": "Get"}]},
+        callables={"get": lambda: payload},
+    )
+
+    assert registry.call_tool("local.get") is payload
+    definition = registry.get_tool_definitions()["local.get"]
+    assert definition["transport"] == "inprocess"
+    assert definition["external"] is False
+
+
+def test_register_tool_requires_a_callable_for_every_method() -> None:
+    registry = Registry("test")
+    methods = [{"name": name, "description": name.title()} for name in ("get", "put", "delete")]
+    with pytest.raises(ValueError, match=r"missing callables for methods: \['delete', 'put'\]"):
+        registry.register_tool(
+            {"name": "local", "base_url": "inprocess://local", "methods": methods},
+            callables={"get": lambda: None},
+        )
+    assert registry.list_tools() == []
+
+
+def test_register_local_mounts_sdk_functions(tool_sdk: Any) -> None:
+    @tool_sdk.mcp_tool(name="calculator")
+    def add(a: int, b: int) -> int:
+        """Add two integers and return the result."""
+        return a + b
+
+    registry = Registry("test")
+    assert registry.register_local([add]) == ["calculator"]
+    assert registry.call_tool("calculator.add", 2, b=3) == 5
+    assert registry.get_tool_definitions()["calculator.add"]["parameters"]["required"] == ["a", "b"]
+
+
+def test_unix_socket_base_url_is_reported_as_uds() -> None:
+    registry = Registry("test")
+    registry.register_tool(
+        {"name": "remote", "base_url": "unix:///run/tools/remote.sock", "methods": [{"name": "ping"}]},
+    )
+
+    assert registry.get_tool_definitions()["remote.ping"]["transport"] == "uds"
@@ -0,0 +1,56 @@
+import importlib.util
+import json
+import logging
+import types
+from pathlib import Path
+
+
+def load_module(path: Path, name: str) -> types.ModuleType:
+    spec = importlib.util.spec_from_file_location(name, str(path))
+    if spec is None:
+        raise ImportError(f"Cannot load module {name} from {path}")
+
+    mod = importlib.util.module_from_spec(spec)
+    loader = spec.loader
+    if loader is None:
+        raise ImportError(f"Cannot load module {name} from {path}")
+
+    loader.exec_module(mod)
+    return mod
+
+
+def load_logging_module() -> types.ModuleType:
+    top = Path(__file__).resolve().parents[1]
+    return load_module(top / "src" / "core" / "logger" / "logging.py", "core_logger_logging")
+
+
+def make_record(msg: str, level: int = logging.INFO, **extra: object) -> logging.LogRecord:
+    record = logging.LogRecord("aux.console.test", level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_serializes_extra() -> None:
+    mod = load_logging_module()
+
+    line = mod.JsonFormatter().format(make_record("Registered", tool_name="calc", tags={"a"}, obj=object()))
+    data = json.loads(line)
+    assert data["message"] == "Registered"
+    assert data["level"] == "INFO"
+    assert data["tool_name"] == "calc"
+    assert data["tags"] == ["a"]
+    assert data["obj"].startswith("<object")
+
+
+def test_sampling_filter_rate_and_levels() -> None:
+    mod = load_logging_module()
+
+    sampler = mod.SamplingFilter(sample_rate=0.25)
+    kept = [sampler.filter(make_record("hot path")) for _ in range(8)]
+    assert kept.count(True) == 2
+    assert sampler.filter(make_record("other message"))
+    assert sampler.filter(make_record("hot path", level=logging.WARNING))
+
+    limiter = mod.SamplingFilter(max_per_second=0.001, burst=2)
+    kept = [limiter.filter(make_record("burst")) for _ in range(5)]
+    assert kept == [True, True, False, False, False]
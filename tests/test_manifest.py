@@ -40,3 +40,29 @@ def test_build_manifest_with_methodspec() -> None:
     m = build_manifest(name="t2", base_url="http://y", methods=[ms])
     assert isinstance(m.methods[0], method_spec)
     assert m.methods[0].description == "d"
+
+
+def test_build_manifest_hashes_match_server() -> None:
+    from core.models.manifest import Manifest
+
+    top = Path(__file__).resolve().parents[1]
+    manifest_path = top / "tool_sdk" / "src" / "tool_sdk" / "core" / "manifest.py"
+    mod = load_module(manifest_path, "tool_sdk_manifest3")
+
+    spec = mod.MethodSpec(name="x", description="d", parameters={"type": "object"})
+    m = mod.build_manifest(name="t3", base_url="http://z", methods=[spec])
+    assert m.hash
+    assert m.methods[0].hash
+    assert spec.hash is None
+
+    unhashed = Manifest.model_validate(m.model_dump(exclude={"hash"})).with_hashes()
+    assert unhashed.hash == m.hash
+    # Optional server-only fields left at their defaults do not change the hash.
+    with_tags = Manifest.model_validate({**m.model_dump(exclude={"hash"}), "tags": []}).with_hashes()
+    assert with_tags.hash == m.hash
+    bare = mod.build_manifest(name="t3", base_url="http://z")
+    assert Manifest(name="t3", base_url="http://z").with_hashes().hash == bare.hash
+
+    changed = mod.build_manifest(name="t3", base_url="http://z", methods=[spec.model_copy(update={"description": "e"})])
+    assert changed.hash != m.hash
+    assert changed.methods[0].hash != m.methods[0].hash
@@ -0,0 +1,101 @@
+import asyncio
+import pstats
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.profiling import Profiler, ProfilerBusy, profiling_router
+
+AUTH = {"Authorization": "Bearer s3cret"}
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(profiling_router("s3cret", Profiler(max_seconds=1.0)))
+    return TestClient(app)
+
+
+@pytest.fixture()
+def busy_thread() -> Iterator[list[bytearray]]:
+    stop = threading.Event()
+    allocated: list[bytearray] = []
+
+    def spin_and_allocate() -> None:
+        while not stop.is_set():
+            allocated.append(bytearray(4096))
+            sum(range(1000))
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=spin_and_allocate, name="busy")
+    thread.start()
+    yield allocated
+    stop.set()
+    thread.join()
+
+
+def test_endpoints_require_the_token(client: TestClient) -> None:
+    assert client.get("/debug/profile", params={"seconds": 0.01}).status_code == 401
+    response = client.get("/debug/memory", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+@pytest.mark.usefixtures("busy_thread")
+def test_sampling_profile_returns_collapsed_stacks(client: TestClient) -> None:
+    response = client.get("/debug/profile", params={"seconds": 0.2, "interval_ms": 1}, headers=AUTH)
+    assert response.status_code == 200
+    busy = [line for line in response.text.splitlines() if line.startswith("busy;")]
+    assert any("spin_and_allocate" in line for line in busy)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in busy)
+
+
+def test_cprofile_returns_a_report_and_raw_stats(client: TestClient, tmp_path: Path) -> None:
+    params: dict[str, Any] = {"seconds": 0.05, "mode": "cprofile", "sort": "tottime"}
+    report = client.get("/debug/profile", params=params, headers=AUTH)
+    assert "function calls" in report.text
+
+    raw = client.get("/debug/profile", params={**params, "raw": True}, headers=AUTH)
+    (tmp_path / "profile.pstats").write_bytes(raw.content)
+    assert pstats.Stats(str(tmp_path / "profile.pstats")).total_calls > 0  # type: ignore[attr-defined]
+
+    assert client.get("/debug/profile", params={**params, "sort": "bogus"}, headers=AUTH).status_code == 400
+
+
+def test_memory_diff_points_at_growing_allocations(client: TestClient, busy_thread: list[bytearray]) -> None:
+    response = client.get("/debug/memory", params={"seconds": 0.2, "top": 5}, headers=AUTH)
+    assert response.status_code == 200
+    assert "test_profiling.py" in response.text
+    assert busy_thread
+
+
+async def test_one_profile_at_a_time() -> None:
+    profiler = Profiler()
+    running = asyncio.create_task(profiler.memory(0.1))
+    await asyncio.sleep(0)
+    with pytest.raises(ProfilerBusy):
+        await profiler.sample(0.01)
+    await running
+
+
+def test_sdk_apps_expose_profiling_only_with_a_token(tool_sdk: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TOOL_PUBLIC_URL", "http://calc:8000")
+
+    @tool_sdk.mcp_tool(name="calc")
+    def add(a: int, b: int) -> int:
+        """Add two integers."""
+        return a + b
+
+    assert TestClient(tool_sdk.create_app([add])).get("/debug/profile").status_code == 404
+
+    monkeypatch.setenv("PROFILING_TOKEN", "s3cret")
+    client = TestClient(tool_sdk.create_app([add]))
+    assert client.get("/debug/profile").status_code == 401
+    response = client.get("/debug/profile", params={"seconds": 0.05, "mode": "cprofile"}, headers=AUTH)
+    assert "function calls" in response.text
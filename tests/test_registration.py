@@ -0,0 +1,101 @@
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+from core.registry.registry import Registry
+
+
+def manifest(descriptions: dict[str, str], base_url: str = "http://calc:5080") -> dict[str, Any]:
+    from core.models.manifest import Manifest
+
+    payload = {
+        "name": "calc",
+        "base_url": base_url,
+        "methods": [{"name": name, "description": text} for name, text in descriptions.items()],
+    }
+    return Manifest.model_validate(payload).with_hashes().model_dump()
+
+
+def queued(registry: Registry) -> list[tuple[str, str]]:
+    items = []
+    while not registry._index_queue.empty():
+        items.append(registry._index_queue.get_nowait())
+    return items
+
+
+def test_unchanged_manifest_is_a_no_op() -> None:
+    registry = Registry("test")
+    registry.register_tool(manifest({"add": "Add numbers", "sub": "Subtract numbers"}))
+    assert len(queued(registry)) == 2
+    proxy = registry.tool_registry["calc.add"]["callable"]
+    versions = registry.version, registry.catalog.version
+
+    registry.register_tool(manifest({"add": "Add numbers", "sub": "Subtract numbers"}))
+
+    assert queued(registry) == []
+    assert (registry.version, registry.catalog.version) == versions
+    assert registry.tool_registry["calc.add"]["callable"] is proxy
+
+
+def test_only_reworded_methods_are_reindexed() -> None:
+    registry = Registry("test")
+    registry.register_tool(manifest({"add": "Add numbers", "sub": "Subtract numbers"}))
+    queued(registry)
+    proxy = registry.tool_registry["calc.add"]["callable"]
+
+    registry.register_tool(manifest({"add": "Add numbers", "sub": "Subtract two numbers", "mul": "Multiply"}))
+
+    assert queued(registry) == [("Subtract two numbers", "calc.sub"), ("Multiply", "calc.mul")]
+    assert registry.tool_registry["calc.add"]["callable"] is proxy
+
+    # A new address rebuilds every proxy but needs no new embeddings.
+    registry.register_tool(manifest({"add": "Add numbers"}, base_url="http://calc-2:5080"))
+    assert queued(registry) == []
+    assert registry.tool_registry["calc.add"]["callable"] is not proxy
+    assert registry.get_tool_definitions()["calc.add"]["base_url"] == "http://calc-2:5080"
+
+
+async def test_unchanged_manifest_requeues_descriptions_that_failed_to_embed(
+    embedder: Callable[..., SimpleNamespace],
+) -> None:
+    registry = Registry("test")
+    calls = 0
+
+    def flaky_embed(*, contents: str | list[str], **kwargs: Any) -> SimpleNamespace:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("embedding service unavailable")
+        return embedder(contents=contents, **kwargs)
+
+    registry._vec_db.embedding_function = flaky_embed
+    registry.start_indexing()
+    registry.register_tool(manifest({"add": "Add numbers"}))
+    await registry.wait_until_indexed()
+    assert registry.query_tools_by_description("Add numbers", top_k=1) == []
+
+    registry.register_tool(manifest({"add": "Add numbers"}))
+    await registry.wait_until_indexed()
+    assert registry.query_tools_by_description("Add numbers", top_k=1) == ["calc.add"]
+    await registry.stop_indexing()
+
+
+def test_register_tools_publishes_a_batch_as_one_version() -> None:
+    registry = Registry("test")
+    registry.register_tool(manifest({"add": "Add numbers", "sub": "Subtract numbers"}))
+    queued(registry)
+    versions = registry.version, registry.catalog.version
+    others = [{**manifest({"echo": f"Echo {i}"}), "name": f"echo{i}"} for i in range(50)]
+
+    # The second calc manifest drops `sub` and adds `mul`, which a third one drops again.
+    registry.register_tools(
+        [manifest({"add": "Add numbers", "mul": "Multiply"}), *others, manifest({"add": "Add numbers"})]
+    )
+    assert (registry.version, registry.catalog.version) == (versions[0] + 1, versions[1] + 1)
+    assert "calc.sub" not in registry.tool_registry
+    assert "calc.mul" not in registry.tool_registry
+    assert set(registry.catalog.definitions) == set(registry.tool_registry)
+    assert {f"echo{i}.echo" for i in range(50)} <= {key for _, key in queued(registry)}
+
+    registry.register_tools(others)
+    assert (registry.version, registry.catalog.version) == (versions[0] + 1, versions[1] + 1)
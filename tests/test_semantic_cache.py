@@ -0,0 +1,33 @@
+import numpy as np
+
+from core.communication.cache import SemanticCache
+
+
+def test_semantic_hit_above_threshold() -> None:
+    cache = SemanticCache(capacity=4, threshold=0.9)
+    cache.put("add two numbers", np.array([1.0, 0.0, 0.0]), "Found tools: ['calc.add']", version=1)
+
+    assert cache.get(np.array([0.99, 0.1, 0.0]), version=1) == "Found tools: ['calc.add']"
+    assert cache.get(np.array([0.0, 1.0, 0.0]), version=1) is None
+    assert cache.get_text("add two numbers", version=1) == "Found tools: ['calc.add']"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_version_change_invalidates() -> None:
+    cache = SemanticCache(capacity=4, threshold=0.9)
+    cache.put("q", np.array([1.0, 0.0]), "old", version=(1, 1))
+
+    assert cache.get_text("q", version=(1, 2)) is None
+    assert cache.get(np.array([1.0, 0.0]), version=(1, 2)) is None
+
+
+def test_oldest_entry_is_evicted() -> None:
+    cache = SemanticCache(capacity=2, threshold=0.9)
+    for i, text in enumerate(["a", "b", "c"]):
+        vector = np.zeros(3)
+        vector[i] = 1.0
+        cache.put(text, vector, text.upper(), version=0)
+
+    assert cache.get_text("a", version=0) is None
+    assert cache.get(np.array([1.0, 0.0, 0.0]), version=0) is None
+    assert cache.get(np.array([0.0, 0.0, 1.0]), version=0) == "C"
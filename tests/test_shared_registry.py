@@ -0,0 +1,60 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from benchmarks.server import fake_embed
+from core.registry.registry import Registry
+from core.registry.shared import SharedRegistry
+
+
+def worker(make_registry: Callable[[], tuple[Registry, Any]], directory: Path) -> tuple[Registry, SharedRegistry, Any]:
+    registry, embedder = make_registry()
+    shared = SharedRegistry(registry, directory)
+    shared.start()
+    return registry, shared, embedder
+
+
+MANIFEST = {
+    "name": "calc",
+    "base_url": "http://calc:5080",
+    "hash": "h1",
+    "methods": [{"name": "add", "description": "Add two integers", "hash": "m1"}],
+}
+
+
+async def test_registration_on_one_worker_reaches_the_others(
+    tmp_path: Path, make_registry: Callable[[], tuple[Registry, Any]]
+) -> None:
+    leader_registry, leader, leader_embedder = worker(make_registry, tmp_path)
+    follower_registry, follower, follower_embedder = worker(make_registry, tmp_path)
+    assert leader.leader
+    assert not follower.leader
+
+    # A /register handled by the follower.
+    follower_registry.register_tool(MANIFEST)
+    follower.publish_manifest(MANIFEST)
+
+    await leader.sync()
+    assert "calc.add" in leader_registry.list_tools()
+    await leader_registry.wait_until_indexed()
+    await leader.sync()
+
+    await follower.sync()
+    assert follower.index_ready
+    assert isinstance(follower_registry._vec_db.snapshot.vectors, np.memmap)
+    # Queried with a precomputed vector: the follower itself must not embed anything.
+    query = np.array(fake_embed(contents="Add two integers").embeddings[0].values)
+    assert follower_registry.query_tools_by_vector(query, top_k=1) == ["calc.add"]
+    assert leader_embedder.texts == ["Add two integers"]
+    assert follower_embedder.texts == []
+
+    await leader_registry.stop_indexing()
+    leader.close()
+    await follower.sync()
+    assert follower.leader
+    await follower_registry.wait_until_indexed()
+    assert follower_embedder.texts == []
+    await follower_registry.stop_indexing()
+    follower.close()
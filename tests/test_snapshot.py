@@ -0,0 +1,152 @@
+import sqlite3
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import pytest
+
+from benchmarks.server import EMBEDDING_DIM
+from core.registry.registry import Registry
+from core.registry.snapshot import SnapshotStore
+
+# The ``make_registry`` fixture: a registry and the embedder recording what it embedded.
+MakeRegistry = Callable[[], tuple[Registry, Any]]
+
+MANIFEST = {
+    "name": "calc",
+    "base_url": "http://calc:5080",
+    "description": "Calculator",
+    "version": "1.2.0",
+    "methods": [
+        {"name": "add", "description": "Add two integers"},
+        {"name": "mul", "description": "Multiply two integers"},
+    ],
+}
+
+
+async def test_restart_restores_tools_and_embeddings(tmp_path: Path, make_registry: MakeRegistry) -> None:
+    store = SnapshotStore(tmp_path)
+    before, _ = make_registry()
+    before.register_tool(MANIFEST)
+    before.start_indexing()
+    await before.wait_until_indexed()
+    await store.save_registry(before)
+    await before.stop_indexing()
+    assert len(list(tmp_path.glob("vectors-*.npy"))) == 1
+
+    state = store.load()
+    assert state is not None
+    assert isinstance(state.vectors, np.memmap)
+
+    after, embedder = make_registry()
+    after.restore_state(state)
+    assert after.get_tool_definitions() == before.get_tool_definitions()
+    after.start_indexing()
+    await after.wait_until_indexed()
+    assert after.index_ready
+    assert embedder.texts == []
+    assert after.query_tools_by_description("Add two integers", top_k=1) == ["calc.add"]
+    await after.stop_indexing()
+
+
+async def test_changed_descriptions_are_embedded_again(tmp_path: Path, make_registry: MakeRegistry) -> None:
+    store = SnapshotStore(tmp_path)
+    before, _ = make_registry()
+    before.register_tool(MANIFEST)
+    before.start_indexing()
+    await before.wait_until_indexed()
+    await store.save_registry(before)
+    await before.stop_indexing()
+
+    after, embedder = make_registry()
+
+    @after.core_tool(name="echo")
+    def echo(text: str) -> str:
+        """Echo text back"""
+        return text
+
+    state = store.load()
+    assert state is not None
+    after.restore_state(state)
+    changed = {**MANIFEST, "methods": [{"name": "add", "description": "Add integers"}]}
+    after.register_tool(changed)
+    after.start_indexing()
+    await after.wait_until_indexed()
+
+    assert sorted(embedder.texts) == ["Add integers", "Echo text back"]
+    assert "calc.mul" not in after.list_tools()
+    await after.stop_indexing()
+
+
+@pytest.fixture()
+async def saved_snapshot(tmp_path: Path, make_registry: MakeRegistry) -> SnapshotStore:
+    store = SnapshotStore(tmp_path)
+    registry, _ = make_registry()
+    registry.register_tool(MANIFEST)
+    registry.start_indexing()
+    await registry.wait_until_indexed()
+    await store.save_registry(registry)
+    await registry.stop_indexing()
+    return store
+
+
+def drop_vectors_file(directory: Path) -> None:
+    for path in directory.glob("vectors-*.npy"):
+        path.unlink()
+
+
+def corrupt_database(directory: Path) -> None:
+    (directory / "registry.sqlite").write_bytes(b"not a database" * 100)
+
+
+def drop_meta_key(directory: Path) -> None:
+    with sqlite3.connect(directory / "registry.sqlite") as db:
+        db.execute("DELETE FROM meta WHERE key = 'vectors_file'")
+    db.close()
+
+
+@pytest.mark.parametrize("damage", [drop_vectors_file, corrupt_database, drop_meta_key])
+def test_unreadable_snapshots_are_ignored(
+    tmp_path: Path, saved_snapshot: SnapshotStore, damage: Callable[[Path], None]
+) -> None:
+    damage(tmp_path)
+    assert saved_snapshot.load() is None
+
+
+async def test_embeddings_from_another_model_are_embedded_again(
+    saved_snapshot: SnapshotStore, make_registry: MakeRegistry
+) -> None:
+    state = saved_snapshot.load()
+    assert state is not None
+    assert state.model == "gemini-embedding-001"
+
+    after, embedder = make_registry()
+    after._model = "text-embedding-004"
+    after.restore_state(state)
+    after.start_indexing()
+    await after.wait_until_indexed()
+    assert sorted(embedder.texts) == sorted(["Calculator", "Add two integers", "Multiply two integers"])
+    await after.stop_indexing()
+
+
+async def test_index_is_rebuilt_when_the_embedding_dimension_changes(
+    saved_snapshot: SnapshotStore, make_registry: MakeRegistry
+) -> None:
+    state = saved_snapshot.load()
+    assert state is not None
+    assert state.vectors.shape == (3, EMBEDDING_DIM)
+
+    after, _ = make_registry()
+    after.restore_state(state)
+    after._vec_db.embedding_function = lambda *, contents, **_: SimpleNamespace(
+        embeddings=[SimpleNamespace(values=[float(len(text)), 1.0]) for text in contents]
+    )
+    after.register_tool({**MANIFEST, "methods": [*MANIFEST["methods"], {"name": "neg", "description": "Negate"}]})
+    after.start_indexing()
+    await after.wait_until_indexed()
+    assert after.index_ready
+    assert after._vec_db.snapshot.vectors.shape == (4, 2)
+    assert after.query_tools_by_vector(np.array([6.0, 1.0]), top_k=1) == ["calc.neg"]
+    await after.stop_indexing()
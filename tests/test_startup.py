@@ -0,0 +1,104 @@
+import asyncio
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from core.registry.registry import Registry
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+SDK_SRC = SRC.parent / "tool_sdk" / "src"
+
+
+def test_import_does_not_touch_embedding_sdk() -> None:
+    code = "import sys, main; assert 'google.genai' not in sys.modules; print(main.tool_registry._pending)"
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        cwd=SRC,
+        env={"PYTHONPATH": f"{SRC}:{SDK_SRC}", "PATH": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert int(proc.stdout.splitlines()[-1]) > 0
+
+
+async def test_registration_is_indexed_in_background(embedder: Callable[..., SimpleNamespace]) -> None:
+    registry = Registry("test")
+    registry._vec_db.embedding_function = embedder
+    registry.register_tool(
+        {
+            "name": "calc",
+            "base_url": "http://calc",
+            "description": "Calculator",
+            "methods": [{"name": "add", "description": "Add two integers"}],
+        },
+    )
+    assert "calc.add" in registry.list_tools()
+    assert registry.indexing_status()["pending"] == 2
+    assert not registry.index_ready
+
+    registry.start_indexing()
+    await registry.wait_until_indexed()
+    assert registry.index_ready
+    assert registry.indexing_status() == {"running": True, "pending": 0, "indexed": 2, "failed": 0}
+    assert registry.query_tools_by_description("Add two integers", top_k=1) == ["calc.add"]
+    await registry.stop_indexing()
+
+
+async def test_failed_embeddings_are_retried_until_indexed(embedder: Callable[..., SimpleNamespace]) -> None:
+    registry = Registry("test")
+    registry.retry_backoff = 0.01
+    failures = 2
+
+    def flaky_embed(*, contents: str | list[str], **kwargs: Any) -> SimpleNamespace:
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise ConnectionError("embedding service unavailable")
+        return embedder(contents=contents, **kwargs)
+
+    registry._vec_db.embedding_function = flaky_embed
+    registry.start_indexing()
+    registry.register_tool({"name": "calc", "base_url": "http://calc", "description": "Calculator"})
+    await registry.wait_until_indexed()
+    assert registry.indexing_status()["failed"] == 1
+    assert not registry.index_ready
+
+    async with asyncio.timeout(5):
+        while not registry.index_ready:
+            await asyncio.sleep(0.01)
+    assert registry.indexing_status() == {"running": True, "pending": 0, "indexed": 1, "failed": 0}
+    assert registry.query_tools_by_description("Calculator", top_k=1) == ["calc"]
+    await registry.stop_indexing()
+
+
+async def test_indexer_survives_a_failing_index_update(
+    monkeypatch: pytest.MonkeyPatch, embedder: Callable[..., SimpleNamespace]
+) -> None:
+    registry = Registry("test")
+    registry.retry_backoff = 0.01
+    registry._vec_db.embedding_function = embedder
+    load = registry._vec_db.load
+    calls = 0
+
+    def failing_once(metadata: list[Any], vectors: Any) -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("all the input array dimensions except for the concatenation axis must match")
+        load(metadata, vectors)
+
+    monkeypatch.setattr(registry._vec_db, "load", failing_once)
+    registry.start_indexing()
+    registry.register_tool({"name": "calc", "base_url": "http://calc", "description": "Calculator"})
+    async with asyncio.timeout(5):
+        while not registry.index_ready:
+            await asyncio.sleep(0.01)
+    assert registry.indexing_status()["running"]
+    assert registry.query_tools_by_description("Calculator", top_k=1) == ["calc"]
+    await registry.stop_indexing()
@@ -15,8 +15,8 @@ for _dependency in _hard_dependencies:
 del _hard_dependencies, _dependency
 
 from tool_sdk.core import mcp_tool, base
-from tool_sdk.app import create_app
+from tool_sdk.app import build_manifests, create_app
 from tool_sdk.logging import get_logger
 
 ToolBase = base.ToolBase
-__all__ = ["mcp_tool", "ToolBase", "create_app", "get_logger"]
+__all__ = ["mcp_tool", "ToolBase", "build_manifests", "create_app", "get_logger"]
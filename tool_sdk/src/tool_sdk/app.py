@@ -8,9 +8,12 @@ import httpx
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+from tool_sdk.blobs import BlobClient, BlobNotFound
 from tool_sdk.core.manifest import Manifest, MethodSpec, build_manifest
 from tool_sdk.core.introspection import get_function_schema
+from tool_sdk.encoding import CompressionMiddleware, FastJSONResponse
 from tool_sdk.logging import get_logger
+from tool_sdk.profiling import profiling_router_from_env
 
 logger = get_logger(__name__)
 
@@ -21,12 +24,17 @@ class InvokeRequest(BaseModel):
     kwargs: dict[str, Any] = {}
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI, manifests: list[Manifest]):
+def _server_url() -> str:
     server_url = os.getenv("MCP_SERVER_URL")
     if not server_url:
         server_port = os.getenv("MCP_SERVER_PORT", "5000")
         server_url = f"http://mcp_server:{server_port}"
+    return server_url
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI, manifests: list[Manifest]):
+    server_url = _server_url()
     try:
         for manifest in manifests:
             tool_name = manifest.name
@@ -52,14 +60,16 @@ async def lifespan(app: FastAPI, manifests: list[Manifest]):
     yield
 
 
-def create_app(tool: Callable | Iterable[Callable]) -> FastAPI:
+def build_manifests(
+    tool: Callable | Iterable[Callable], base_url: str | None
+) -> tuple[list[Manifest], dict[str, Callable]]:
     """
-    Create an SDK FastAPI app around:
-      - a collection of standalone functions decorated with @mcp_tool(name=...)
+    Group functions decorated with @mcp_tool(name=...) into one manifest per tool name.
+
+    Returns the manifests and the functions keyed by method name.
     """
 
     method_map: dict[str, Callable] = {}
-    tool_url = os.getenv("TOOL_PUBLIC_URL")
 
     grouped: dict[str, dict[str, Any]] = {}
     funcs = list(tool) if isinstance(tool, Iterable) and not callable(tool) else [tool]  # type: ignore[arg-type]
@@ -104,16 +114,53 @@ def create_app(tool: Callable | Iterable[Callable]) -> FastAPI:
         manifest = build_manifest(
             name=tool_name,
             description="",
-            base_url=tool_url,
+            base_url=base_url,
             methods=method_specs,
         )
         manifests.append(manifest)
 
-    app_title = next(iter(grouped.keys())) if len(grouped) == 1 else "MCP Tool SDK App"
+    return manifests, method_map
+
+
+def create_app(tool: Callable | Iterable[Callable]) -> FastAPI:
+    """
+    Create an SDK FastAPI app around:
+      - a collection of standalone functions decorated with @mcp_tool(name=...)
+
+    Set TOOL_PUBLIC_URL to ``unix:///path/to.sock`` (and serve the app with
+    ``uvicorn.run(app, uds=...)``) to let a server on the same host reach the tool
+    over a Unix domain socket instead of TCP.
+
+    Responses are rendered with orjson and compressed with zstd/gzip above
+    COMPRESSION_MIN_SIZE bytes when the caller accepts it; gzip/zstd request
+    bodies are decoded transparently.
+
+    Results larger than BLOB_INLINE_LIMIT_BYTES are returned as blob handles
+    and handles in arguments are resolved before the call (see ``BlobClient``);
+    set BLOB_STORE_DIR to the server's blob directory when on the same host.
+
+    Setting PROFILING_TOKEN adds /debug/profile and /debug/memory, which require
+    ``Authorization: Bearer <token>``.
+    """
+
+    tool_url = os.getenv("TOOL_PUBLIC_URL")
+    manifests, method_map = build_manifests(tool, tool_url)
+
+    app_title = manifests[0].name if len(manifests) == 1 else "MCP Tool SDK App"
     app = FastAPI(
         title=f"{app_title} SDK App",
         lifespan=partial(lifespan, manifests=manifests),
+        default_response_class=FastJSONResponse,
     )
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+        max_request_size=int(
+            os.getenv("MAX_REQUEST_BODY_BYTES", str(32 * 1024 * 1024))
+        ),
+    )
+
+    blobs = BlobClient.from_env(_server_url())
 
     for method_name, fn in method_map.items():
         route_path = f"/invoke/{method_name}"
@@ -121,8 +168,14 @@ def create_app(tool: Callable | Iterable[Callable]) -> FastAPI:
         def endpoint_factory(f: Callable):
             async def _endpoint(req: InvokeRequest):
                 try:
-                    result = f(*req.args, **req.kwargs)
-                    return {"result": result}
+                    args = await blobs.resolve(req.args)
+                    kwargs = await blobs.resolve(req.kwargs)
+                    result = f(*args, **kwargs)
+                    return FastJSONResponse({"result": await blobs.offload(result)})
+                except BlobNotFound as e:
+                    raise HTTPException(
+                        status_code=404, detail=f"Blob {e} not found or expired"
+                    )
                 except Exception as e:
                     raise HTTPException(status_code=500, detail=str(e))
 
@@ -130,6 +183,10 @@ def create_app(tool: Callable | Iterable[Callable]) -> FastAPI:
 
         app.post(route_path)(endpoint_factory(fn))
 
+    profiling = profiling_router_from_env()
+    if profiling is not None:
+        app.include_router(profiling)
+
     @app.get("/manifest", response_model=list[Manifest])
     async def get_manifest():
         return manifests
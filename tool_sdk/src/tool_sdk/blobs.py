@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import mmap
+import os
+import re
+import uuid
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+import numpy as np
+import orjson
+
+from tool_sdk.encoding import dumps
+from tool_sdk.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Shared with the server's blob store. A handle is a small JSON object,
+# {"$blob": "<sha256>.<json|npy>", "size": <bytes>}, standing in for a value.
+HANDLE_KEY = "$blob"
+MEDIA_TYPES = {".json": "application/json", ".npy": "application/x-npy"}
+BLOB_ID = re.compile(r"[0-9a-f]{64}\.(json|npy)")
+
+
+class BlobNotFound(KeyError):
+    """Raised for a handle whose blob does not exist (never stored, or evicted)."""
+
+
+def is_handle(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get(HANDLE_KEY), str)
+
+
+def encode_blob(value: Any) -> tuple[bytes, str]:
+    """Serialize ``value`` for the store: arrays as ``.npy`` (so they can be
+    memory-mapped), the rest as JSON."""
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        buffer = io.BytesIO()
+        np.save(buffer, value, allow_pickle=False)
+        return buffer.getvalue(), ".npy"
+    return dumps(value), ".json"
+
+
+def decode_blob(data: bytes, suffix: str) -> Any:
+    if suffix == ".npy":
+        return np.load(io.BytesIO(data), allow_pickle=False)
+    return orjson.loads(data)
+
+
+class BlobClient:
+    """
+    Pass large tool arguments and results by handle through the server's blob store.
+
+    Results serializing to more than ``inline_limit`` bytes are stored and returned
+    as a handle; handles in arguments are resolved before the tool is called. On the
+    server's host (``directory`` is the server's ``BLOB_STORE_DIR``) blobs are
+    written and read directly, ``.npy`` blobs memory-mapped; elsewhere they go
+    through the server's ``/blobs`` endpoints.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        directory: Optional[str] = None,
+        inline_limit: Optional[int] = None,
+    ) -> None:
+        self.server_url = server_url.rstrip("/")
+        self.directory = Path(directory) if directory else None
+        self.inline_limit = inline_limit
+
+    @classmethod
+    def from_env(cls, server_url: str) -> BlobClient:
+        inline_limit = os.getenv("BLOB_INLINE_LIMIT_BYTES")
+        return cls(
+            server_url,
+            directory=os.getenv("BLOB_STORE_DIR") or None,
+            inline_limit=int(inline_limit) if inline_limit else None,
+        )
+
+    async def resolve(self, value: Any) -> Any:
+        """``value`` with every handle in it, at any depth, replaced by its value."""
+        if is_handle(value):
+            return await self.load(value[HANDLE_KEY])
+        if isinstance(value, dict):
+            return {key: await self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [await self.resolve(item) for item in value]
+        return value
+
+    async def load(self, blob_id: str) -> Any:
+        """The value of a blob. Raises ``BlobNotFound`` for unknown or malformed ids."""
+        if not BLOB_ID.fullmatch(blob_id):
+            raise BlobNotFound(blob_id)
+        if self.directory is not None:
+            try:
+                return load_file(self.directory / blob_id)
+            except FileNotFoundError:
+                logger.debug("Blob %s not in %s; fetching it", blob_id, self.directory)
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            resp = await client.get(f"{self.server_url}/blobs/{blob_id}")
+            if resp.status_code == 404:
+                raise BlobNotFound(blob_id)
+            resp.raise_for_status()
+        return decode_blob(resp.content, Path(blob_id).suffix)
+
+    async def offload(self, value: Any) -> Any:
+        """A handle for ``value`` when it serializes past ``inline_limit``, else ``value``.
+
+        Values kept inline come back pre-serialized (``orjson.Fragment``) so the
+        response does not encode them a second time.
+        """
+        if self.inline_limit is None or value is None:
+            return value
+        if isinstance(value, (bool, int, float)):
+            return value
+        data, suffix = encode_blob(value)
+        if len(data) <= self.inline_limit:
+            return value if suffix == ".npy" else orjson.Fragment(data)
+        return await self.put(data, suffix)
+
+    async def put(self, data: bytes, suffix: str) -> dict[str, Any]:
+        if self.directory is not None:
+            return await asyncio.to_thread(store_file, self.directory, data, suffix)
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            resp = await client.post(
+                f"{self.server_url}/blobs",
+                content=data,
+                headers={"Content-Type": MEDIA_TYPES[suffix]},
+            )
+            resp.raise_for_status()
+        return resp.json()
+
+
+def load_file(path: Path) -> Any:
+    """The value of a blob file, read through a memory map; ``.npy`` blobs stay
+    mapped (read-only)."""
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r", allow_pickle=False)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+
+def store_file(directory: Path, data: bytes, suffix: str) -> dict[str, Any]:
+    """Write ``data`` to ``directory`` under its content address and return its
+    handle. The write is atomic, so readers never see a partial blob."""
+    blob_id = f"{sha256(data).hexdigest()}{suffix}"
+    path = directory / blob_id
+    try:
+        os.utime(path)  # Already stored; count this as a use.
+    except FileNotFoundError:
+        tmp = directory / f".{blob_id}.{uuid.uuid4().hex[:8]}.tmp"
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    return {HANDLE_KEY: blob_id, "size": len(data)}
@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
@@ -17,6 +20,9 @@ class MethodSpec(BaseModel):
         default=None,
         description="HTTP method used to invoke this method (e.g., GET, POST)",
     )
+    hash: Optional[str] = Field(
+        default=None, description="Content hash of the other fields"
+    )
 
 
 class Manifest(BaseModel):
@@ -24,6 +30,35 @@ class Manifest(BaseModel):
     description: str = ""
     base_url: str
     methods: list[MethodSpec] = []
+    hash: Optional[str] = None
+
+
+def content_hash(payload: Any) -> str:
+    """SHA-256 of the canonical JSON form of ``payload``."""
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def hash_method(spec: BaseModel) -> str:
+    """Hash a method spec, the SDK's or the server's, without its own hash."""
+    return content_hash(spec.model_dump(exclude={"hash"}, exclude_defaults=True))
+
+
+def hash_manifest(manifest: BaseModel) -> str:
+    """
+    Hash a manifest whose methods are already hashed.
+
+    Fields left at their defaults are not hashed, so adding an optional field
+    to the models does not change the hash of existing manifests. The server
+    hashes manifests with this same function, and skips re-registering a
+    manifest it already has.
+    """
+    payload = manifest.model_dump(exclude={"hash", "methods"}, exclude_defaults=True)
+    methods = manifest.model_dump(include={"methods": {"__all__": {"hash"}}})
+    payload["methods"] = [m["hash"] for m in methods["methods"]]
+    return content_hash(payload)
 
 
 def build_manifest(
@@ -35,10 +70,10 @@ def build_manifest(
 ) -> Manifest:
     specs: list[MethodSpec] = []
     for m in methods or []:
-        if isinstance(m, MethodSpec):
-            specs.append(m)
-        else:
-            specs.append(MethodSpec(name=str(m)))
-    return Manifest(
+        spec = m if isinstance(m, MethodSpec) else MethodSpec(name=str(m))
+        specs.append(spec.model_copy(update={"hash": hash_method(spec)}))
+    manifest = Manifest(
         name=name, description=description or "", base_url=base_url, methods=specs
     )
+    manifest.hash = hash_manifest(manifest)
+    return manifest
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import gzip
+import io
+import threading
+import zlib
+from typing import Any, Callable, Optional
+
+import anyio.to_thread
+import orjson
+import zstandard
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tool_sdk.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Preferred first when the client weighs encodings equally.
+SUPPORTED_ENCODINGS = ("zstd", "gzip")
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    # orjson handles the common types natively; anything else (pydantic models,
+    # sets, ...) goes through FastAPI.
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` exactly as ``FastJSONResponse`` renders it."""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Returning one directly from an endpoint also skips FastAPI's response-model
+    validation and ``jsonable_encoder`` pass, which dominate the cost of large
+    catalog and tool-result payloads.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RequestDecodingError(Exception):
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the supported encoding with the highest q-value in an ``Accept-Encoding``
+    header, if any."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def decompress(body: bytes, encoding: str, max_size: int) -> bytes:
+    """Decode a request body, refusing to inflate it past ``max_size`` bytes."""
+    encoding = encoding.strip().lower()
+    if encoding == "gzip":
+        stream: Any = gzip.GzipFile(fileobj=io.BytesIO(body))
+    elif encoding == "zstd":
+        # Streaming clients may send one frame per flush.
+        stream = zstandard.ZstdDecompressor().stream_reader(
+            io.BytesIO(body), read_across_frames=True
+        )
+    else:
+        raise RequestDecodingError(f"Unsupported Content-Encoding '{encoding}'", 415)
+    chunks, size = [], 0
+    try:
+        # A read may stop at a frame boundary; read on to the limit or the end.
+        while size <= max_size:
+            chunk = stream.read(max_size + 1 - size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+    except (OSError, EOFError, zlib.error, zstandard.ZstdError) as e:
+        raise RequestDecodingError(f"Malformed {encoding} body: {e}", 400) from e
+    data = b"".join(chunks)
+    if len(data) > max_size:
+        raise RequestDecodingError(f"Decompressed body exceeds {max_size} bytes", 413)
+    return data
+
+
+class CompressionMiddleware:
+    """
+    Negotiated response compression and compressed request bodies.
+
+    Complete (non-streaming) responses of at least ``minimum_size`` bytes are
+    compressed with zstd or gzip, whichever the client's ``Accept-Encoding`` prefers;
+    from ``thread_min_size`` bytes on, in a worker thread, so large bodies do not
+    stall the event loop. Request bodies sent with ``Content-Encoding: gzip`` or
+    ``zstd`` are decoded before they reach the endpoint.
+
+    Used by both the MCP server and SDK tool apps.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        max_request_size: int = 32 * 1024 * 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        thread_min_size: int = 256 * 1024,
+    ) -> None:
+        """Initialize the middleware.
+        Args:
+            app (ASGIApp): The wrapped application.
+            minimum_size (int): Smallest response body, in bytes, worth compressing.
+            max_request_size (int): Largest decompressed request body accepted, in
+                bytes.
+            gzip_level (int): gzip compression level.
+            zstd_level (int): zstd compression level.
+            thread_min_size (int): Smallest response body, in bytes, compressed off
+                the event loop.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_request_size = max_request_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.thread_min_size = thread_min_size
+        # zstd compressors must not be used by two threads at once; each thread gets
+        # its own.
+        self._local = threading.local()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "identity").strip().lower()
+        if content_encoding != "identity":
+            try:
+                raw = await _read_body(receive, self.max_request_size)
+                body = decompress(raw, content_encoding, self.max_request_size)
+            except RequestDecodingError as e:
+                logger.warning("Rejected %s request body: %s", content_encoding, e)
+                response = PlainTextResponse(str(e), status_code=e.status_code)
+                await response(scope, receive, send)
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (k, v)
+                for k, v in scope["headers"]
+                if k not in (b"content-encoding", b"content-length")
+            ] + [(b"content-length", str(len(body)).encode())]
+            receive = _replay(body, receive)
+
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        sender = _CompressingSend(
+            send,
+            encoding,
+            self._compressor(encoding),
+            self.minimum_size,
+            self.thread_min_size,
+        )
+        await self.app(scope, receive, sender)
+
+    def _compressor(self, encoding: str) -> Callable[[bytes], bytes]:
+        if encoding == "zstd":
+            return self._zstd_compress
+        return lambda body: gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _zstd_compress(self, body: bytes) -> bytes:
+        compressor = getattr(self._local, "zstd", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=self.zstd_level)
+            self._local.zstd = compressor
+        return compressor.compress(body)
+
+
+class _CompressingSend:
+    """Hold back the response start until the first body chunk shows whether
+    compression applies."""
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        compress: Callable[[bytes], bytes],
+        minimum_size: int,
+        thread_min_size: int,
+    ) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.compress = compress
+        self.minimum_size = minimum_size
+        self.thread_min_size = thread_min_size
+        self.start: Optional[Message] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.start is None:
+            await self.send(message)
+            return
+
+        start, self.start = self.start, None
+        body = message.get("body", b"")
+        headers = MutableHeaders(raw=list(start.get("headers", [])))
+        # Streaming responses are passed through: compressing them would mean
+        # buffering the whole stream.
+        if (
+            message.get("more_body", False)
+            or len(body) < self.minimum_size
+            or "content-encoding" in headers
+        ):
+            await self.send(start)
+            await self.send(message)
+            return
+
+        if len(body) >= self.thread_min_size:
+            compressed = await anyio.to_thread.run_sync(self.compress, body)
+        else:
+            compressed = self.compress(body)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        await self.send({**start, "headers": headers.raw})
+        await self.send({"type": "http.response.body", "body": compressed})
+
+
+async def _read_body(receive: Receive, max_size: int) -> bytes:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_size:
+            raise RequestDecodingError(f"Request body exceeds {max_size} bytes", 413)
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _replay(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
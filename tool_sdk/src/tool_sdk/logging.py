@@ -27,5 +27,9 @@ except Exception:
         _configured = True
 
     def get_logger(name: Optional[str] = None):
+        server_logger = sys.modules.get("core.logger")
+        if server_logger is not None:
+            # Loaded by the MCP server itself; log through its configuration.
+            return server_logger.get_logger(name)
         _configure_basic()
         return logging.getLogger(name or "tool_sdk")
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import FrameType
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response
+
+# Shared with the MCP server, so it and tool apps expose the same endpoints.
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> Counter[str]:
+    """Sample the Python stack of every other thread every ``interval`` seconds, for
+    ``seconds``.
+
+    Returns how often each stack was seen, keyed by its collapsed form
+    (``thread;outer;...;inner``), the input format of flamegraph.pl and speedscope.
+    Blocks the calling thread.
+    """
+    counts: Counter[str] = Counter()
+    me = threading.get_ident()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stack: list[str] = []
+            current: Optional[FrameType] = frame
+            while current is not None:
+                stack.append(_frame_label(current))
+                current = current.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts
+
+
+class Profiler:
+    """
+    On-demand CPU and memory profiling of the running process, one profile at a time.
+
+    ``sample`` is a low-overhead sampling profiler over all threads. ``cprofile`` runs
+    the deterministic profiler on the event loop thread, where request handling (and
+    in tool apps, the tool functions) happens; work handed to thread pools only shows
+    up in ``sample``. ``memory`` diffs two ``tracemalloc`` snapshots taken
+    ``seconds`` apart; when tracing was off it is only turned on for that window.
+    """
+
+    def __init__(self, max_seconds: float = 60.0) -> None:
+        self.max_seconds = max_seconds
+        self._lock = asyncio.Lock()
+
+    async def sample(self, seconds: float, interval: float = 0.005) -> str:
+        async with self._running():
+            counts = await asyncio.to_thread(
+                sample_stacks, self._clamp(seconds), interval
+            )
+        return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+    async def cprofile(
+        self, seconds: float, sort: str = "cumulative", limit: int = 50
+    ) -> tuple[str, bytes]:
+        """Profile the event loop for ``seconds``. Returns the pstats report and the
+        raw stats.
+
+        The raw stats load with ``pstats.Stats(path)`` once written to a file.
+        """
+        async with self._running():
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                await asyncio.sleep(self._clamp(seconds))
+            finally:
+                profile.disable()
+        report = io.StringIO()
+        stats = pstats.Stats(profile, stream=report)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        profile.create_stats()
+        return report.getvalue(), marshal.dumps(profile.stats)
+
+    async def memory(self, seconds: float, top: int = 25, frames: int = 1) -> str:
+        """Allocation growth by source line (or by traceback when ``frames`` > 1) over
+        ``seconds``."""
+        async with self._running():
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start(frames)
+            try:
+                before = await asyncio.to_thread(tracemalloc.take_snapshot)
+                await asyncio.sleep(self._clamp(seconds))
+                after = await asyncio.to_thread(tracemalloc.take_snapshot)
+            finally:
+                if started:
+                    tracemalloc.stop()
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)
+        stats = after.filter_traces(ignore).compare_to(
+            before.filter_traces(ignore), "traceback" if frames > 1 else "lineno"
+        )
+        lines = []
+        for stat in stats[:top]:
+            lines.append(str(stat))
+            if frames > 1:
+                lines.extend(f"    {line}" for line in stat.traceback.format())
+        return "\n".join(lines) + "\n"
+
+    def _clamp(self, seconds: float) -> float:
+        return max(0.0, min(seconds, self.max_seconds))
+
+    def _running(self) -> asyncio.Lock:
+        if self._lock.locked():
+            raise ProfilerBusy("Another profile is running")
+        return self._lock
+
+
+def profiling_router(token: str, profiler: Optional[Profiler] = None) -> APIRouter:
+    """Debug endpoints for profiling a live process, protected by
+    ``Authorization: Bearer <token>``.
+    Args:
+        token (str): Shared secret callers must present.
+        profiler (Profiler, optional): Defaults to one allowing profiles of up to 60
+            seconds.
+    Returns:
+        APIRouter: ``GET /debug/profile`` and ``GET /debug/memory``.
+    """
+    profiler = profiler or Profiler()
+    expected = f"Bearer {token}".encode()
+
+    def authorize(request: Request) -> None:
+        supplied = request.headers.get("authorization", "").encode()
+        if not hmac.compare_digest(supplied, expected):
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid profiling token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    router = APIRouter(
+        prefix="/debug", dependencies=[Depends(authorize)], include_in_schema=False
+    )
+
+    @router.get("/profile")
+    async def profile(
+        seconds: float = Query(5.0, gt=0, description="Profile duration in seconds"),
+        mode: Literal["sample", "cprofile"] = Query(
+            "sample",
+            description="sample: collapsed stacks of all threads; cprofile: pstats",
+        ),
+        interval_ms: float = Query(
+            5.0, gt=0, description="Sampling interval in milliseconds"
+        ),
+        sort: str = Query("cumulative", description="pstats sort key"),
+        limit: int = Query(50, ge=1, description="pstats rows"),
+        raw: bool = Query(
+            False,
+            description="Return marshalled stats for pstats.Stats instead of a report",
+        ),
+    ) -> Response:
+        if sort not in pstats.Stats.sort_arg_dict_default:
+            raise HTTPException(status_code=400, detail=f"Unknown sort key: {sort}")
+        try:
+            if mode == "sample":
+                collapsed = await profiler.sample(seconds, interval_ms / 1000.0)
+                return PlainTextResponse(collapsed)
+            report, stats = await profiler.cprofile(seconds, sort, limit)
+        except ProfilerBusy as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        if raw:
+            return Response(stats, media_type="application/octet-stream")
+        return PlainTextResponse(report)
+
+    @router.get("/memory")
+    async def memory(
+        seconds: float = Query(
+            10.0, ge=0, description="Seconds between the two snapshots"
+        ),
+        top: int = Query(25, ge=1),
+        frames: int = Query(
+            1, ge=1, le=50, description="Traceback depth; above 1 groups by traceback"
+        ),
+    ) -> PlainTextResponse:
+        try:
+            return PlainTextResponse(await profiler.memory(seconds, top, frames))
+        except ProfilerBusy as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+    return router
+
+
+def profiling_router_from_env() -> Optional[APIRouter]:
+    """The profiling router when ``PROFILING_TOKEN`` is set, else None (the endpoints
+    do not exist)."""
+    token = os.getenv("PROFILING_TOKEN")
+    if not token:
+        return None
+    max_seconds = float(os.getenv("PROFILING_MAX_SECONDS", "60"))
+    return profiling_router(token, Profiler(max_seconds=max_seconds))
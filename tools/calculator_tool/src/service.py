@@ -12,5 +12,10 @@ def add(a: int, b: int) -> int:
 
 if __name__ == "__main__":
     app = create_app(add)
-    port = int(os.environ.get("TOOL_PORT", "5080"))
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="info", log_config=None)
+    uds = os.environ.get("TOOL_UDS")
+    if uds:
+        # Pair with TOOL_PUBLIC_URL=unix://<TOOL_UDS> so a server on the same host skips TCP.
+        uvicorn.run(app, uds=uds, log_level="info", log_config=None)
+    else:
+        port = int(os.environ.get("TOOL_PORT", "5080"))
+        uvicorn.run(app, host="0.0.0.0", port=port, log_level="info", log_config=None)